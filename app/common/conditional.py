@@ -0,0 +1,70 @@
+import hashlib
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+# Clients must revalidate before reusing a response, and shared caches
+# must not store per-user data.
+CACHE_CONTROL = "private, no-cache"
+
+
+def timestamp_us(value: datetime) -> int:
+    """Exact microseconds since the epoch, matching the SQL side of list validators."""
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def quote_etag(tag: str, variant: str = "") -> str:
+    """`variant` tells apart representations of one resource, e.g. sparse fieldsets."""
+    return f'"{tag}-{variant}"' if variant else f'"{tag}"'
+
+
+def row_etag(row_id: int, updated_at: datetime, variant: str = "") -> str:
+    return quote_etag(f"{row_id}-{timestamp_us(updated_at)}", variant)
+
+
+def rows_etag(rows, variant: str = "") -> str:
+    """ETag of a list of rows; `BaseDAO.get_page_digest` computes the same digest in SQL."""
+    value = ",".join(f"{row.id}:{timestamp_us(row.updated_at)}" for row in rows)
+    return quote_etag(hashlib.md5(value.encode()).hexdigest(), variant)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    Evaluates If-None-Match, or If-Modified-Since when no If-None-Match is
+    sent, against the current validators of a resource.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have whole-second resolution.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def has_conditions(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def validator_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -0,0 +1,142 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "Number of SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Total time spent executing SQL per request",
+    ["method", "route"],
+)
+REQUEST_POOL_WAIT = Histogram(
+    "http_request_db_pool_wait_seconds",
+    "Time spent waiting for a pooled DB connection per request",
+    ["method", "route"],
+)
+REQUEST_CRYPTO_TIME = Histogram(
+    "http_request_crypto_seconds",
+    "Time spent in bcrypt and JWT work per request",
+    ["method", "route", "operation"],
+)
+DB_STATEMENTS = Counter(
+    "db_statements_total",
+    "SQL statements executed, inside or outside of requests",
+    ["engine"],
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    crypto: dict[str, float] = field(default_factory=dict)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def record_crypto(operation: str, elapsed: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.crypto[operation] = stats.crypto.get(operation, 0.0) + elapsed
+
+
+def record_pool_wait(elapsed: float):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.pool_wait += elapsed
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Counts and times every statement run on `engine` (pass `.sync_engine` for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_STATEMENTS.labels(name).inc()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and per-request DB/crypto work by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded.
+            template = route.path if route is not None else "unmatched"
+            method = scope["method"]
+            REQUEST_LATENCY.labels(method, template, str(status_code)).observe(elapsed)
+            REQUEST_DB_STATEMENTS.labels(method, template).observe(stats.statements)
+            REQUEST_DB_TIME.labels(method, template).observe(stats.db_time)
+            REQUEST_POOL_WAIT.labels(method, template).observe(stats.pool_wait)
+            for operation, spent in stats.crypto.items():
+                REQUEST_CRYPTO_TIME.labels(method, template, operation).observe(spent)
+
+
+class StatsCollector(Collector):
+    """Exposes the numeric values of a component's `stats()` dict as gauges at scrape time."""
+
+    def __init__(self, prefix: str, stats_fn):
+        self.prefix = prefix
+        self.stats_fn = stats_fn
+
+    def collect(self):
+        for key, value in self.stats_fn().items():
+            if isinstance(value, bool | int | float):
+                yield GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key}", value=float(value))
+
+
+def register_stats(prefix: str, stats_fn):
+    REGISTRY.register(StatsCollector(prefix, stats_fn))
@@ -0,0 +1,17 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response whose UTC datetimes end in `Z`, like Pydantic's output."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,22 +1,169 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import (
+    BigInteger,
+    String,
+    delete,
+    extract,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.exc import IntegrityError
 
 ModelType = TypeVar("ModelType")
 
+FILTER_OPS = ("eq", "in", "range", "prefix")
+
+UNIQUE_VIOLATION = "23505"
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    return getattr(error.orig, "sqlstate", None) == UNIQUE_VIOLATION
+
+
+@dataclass(frozen=True)
+class Filter:
+    """
+    One condition on a column: `eq` takes a value, `in` a list of values,
+    `range` a `(low, high)` pair matching low <= value < high with either
+    end optional, and `prefix` a string matched case-insensitively.
+    """
+    column: str
+    op: str
+    value: Any
+
+
 class BaseDAO(Generic[ModelType]):
     model: type[ModelType] = None
+    # Column -> operators a caller may filter it with. Only these are
+    # accepted by `where_filters`, and each should be backed by an index.
+    filterable: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def where_filters(cls, filters: list[Filter]) -> list:
+        """Turns `filters` into WHERE clauses, rejecting any not in `filterable`."""
+        clauses = []
+        for f in filters:
+            if f.op not in cls.filterable.get(f.column, ()):
+                raise ValueError(f"Cannot filter {cls.model.__name__}.{f.column} with {f.op!r}")
+            column = getattr(cls.model, f.column)
+            if f.op == "eq":
+                clauses.append(column == f.value)
+            elif f.op == "in":
+                clauses.append(column.in_(f.value))
+            elif f.op == "range":
+                low, high = f.value
+                if low is not None:
+                    clauses.append(column >= low)
+                if high is not None:
+                    clauses.append(column < high)
+            elif f.op == "prefix":
+                # lower(column) LIKE 'value%' with wildcards escaped, which
+                # a `lower(column) text_pattern_ops` index can serve.
+                pattern = f.value.lower().replace("/", "//").replace("%", "/%").replace("_", "/_")
+                clauses.append(func.lower(column).like(pattern + "%", escape="/"))
+        return clauses
+
+    @classmethod
+    def page_query(cls, columns, limit: int, after: int | None = None, filters: list[Filter] = ()):
+        """Keyset page on `id` of `columns`, narrowed by `filters`."""
+        stmt = select(*columns).where(*cls.where_filters(filters)).order_by(cls.model.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(cls.model.id > after)
+        return stmt
 
     @classmethod
     async def get_by_id(cls, db, obj_id: int) -> ModelType | None:
         q = await db.execute(select(cls.model).where(cls.model.id == obj_id))
         return q.scalar_one_or_none()
 
+    @classmethod
+    async def get_row_by_id(cls, db, obj_id: int, columns: tuple[str, ...]):
+        """Like `get_by_id`, but selects only `columns` and returns a row."""
+        q = await db.execute(
+            select(*(getattr(cls.model, name) for name in columns)).where(cls.model.id == obj_id)
+        )
+        return q.one_or_none()
+
+    @classmethod
+    async def get_many_by_ids(cls, db, ids: list[int]) -> list[ModelType]:
+        q = await db.execute(
+            select(cls.model).where(cls.model.id.in_(ids)).order_by(cls.model.id)
+        )
+        return q.scalars().all()
+
     @classmethod
     async def get_all(cls, db,) -> list[ModelType]:
         q = await db.execute(select(cls.model))
         return q.scalars().all()
 
+    @classmethod
+    async def get_page_rows(
+        cls,
+        db,
+        columns: tuple[str, ...],
+        limit: int,
+        after: int | None = None,
+        filters: list[Filter] = (),
+    ) -> list:
+        """
+        Keyset pagination on `id`: up to `limit` rows with id > `after` that
+        match `filters`, selecting only `columns`.
+        """
+        stmt = cls.page_query(
+            [getattr(cls.model, name) for name in columns], limit, after, filters
+        )
+        q = await db.execute(stmt)
+        return q.all()
+
+    @classmethod
+    async def get_page_digest(
+        cls, db, limit: int, after: int | None = None, filters: list[Filter] = ()
+    ) -> str:
+        """
+        MD5 over the ids and `updated_at` of the rows `get_page_rows` would
+        return, without loading them. Matches `app.common.conditional.rows_etag`.
+        """
+        page = cls.page_query(
+            [cls.model.id, cls.model.updated_at], limit, after, filters
+        ).subquery()
+        micros = (extract("epoch", page.c.updated_at) * 1000000).cast(BigInteger).cast(String)
+        stmt = select(func.md5(func.coalesce(
+            func.string_agg(
+                page.c.id.cast(String).concat(literal(":")).concat(micros),
+                aggregate_order_by(literal(","), page.c.id),
+            ),
+            "",
+        )))
+        q = await db.execute(stmt)
+        return q.scalar_one()
+
+    @classmethod
+    async def stream_all(
+        cls, db, batch_size: int = 1000, columns: tuple[str, ...] | None = None
+    ) -> AsyncIterator:
+        """
+        Yields every entity, or a row of just `columns` when given, through a
+        server-side cursor, `batch_size` rows at a time.
+        """
+        if columns is None:
+            stmt = select(cls.model)
+        else:
+            stmt = select(*(getattr(cls.model, name) for name in columns))
+        stmt = stmt.order_by(cls.model.id).execution_options(yield_per=batch_size)
+        if columns is None:
+            result = await db.stream_scalars(stmt)
+        else:
+            result = await db.stream(stmt)
+        async for obj in result:
+            yield obj
+
     @classmethod
     async def get_one_by_filters(cls, db, **filters: Any) -> ModelType | None:
         stmt = select(cls.model)
@@ -32,3 +179,28 @@ class BaseDAO(Generic[ModelType]):
             stmt = stmt.where(getattr(cls.model, attr) == value)
         q = await db.execute(stmt)
         return q.scalars().all()
+
+    @classmethod
+    async def bulk_create(cls, db, rows: list[dict]) -> list[ModelType]:
+        """Multi-row INSERT ... RETURNING. Does not commit."""
+        if not rows:
+            return []
+        q = await db.execute(insert(cls.model).returning(cls.model), rows)
+        return q.scalars().all()
+
+    @classmethod
+    async def bulk_update(cls, db, rows: list[dict]) -> None:
+        """executemany UPDATE by primary key; every row must contain `id`. Does not commit."""
+        if rows:
+            await db.execute(update(cls.model), rows)
+
+    @classmethod
+    async def bulk_delete(cls, db, ids: list[int]) -> list[int]:
+        """Deletes rows by id in one statement and returns the ids that existed. Does not commit."""
+        if not ids:
+            return []
+        q = await db.execute(
+            delete(cls.model).where(cls.model.id.in_(ids)).returning(cls.model.id),
+            execution_options={"synchronize_session": False},
+        )
+        return q.scalars().all()
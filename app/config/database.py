@@ -1,21 +1,189 @@
+import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
 
-from sqlalchemy import DateTime, create_engine, func
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+from sqlalchemy import DateTime, Engine, Select, create_engine, func
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.common.metrics import instrument_engine, record_pool_wait
 
 from .settings import settings
 
-engine = create_async_engine(settings.DATABASE_URL)
-async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+logger = logging.getLogger(__name__)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_pool_wait(time.perf_counter() - start)
+
+
+def pool_options(nullpool: bool, queue_pool_class: type) -> dict:
+    if nullpool:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": queue_pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def asyncpg_connect_args() -> dict:
+    connect_args = {
+        "timeout": settings.DB_CONNECT_TIMEOUT,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+    }
+    if settings.DB_PGBOUNCER:
+        # In transaction mode consecutive statements may run on different
+        # server connections, so named prepared statements cannot be cached
+        # and their names must never repeat.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+        )
+    else:
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+    return connect_args
+
+
+def log_pool_config(engine: Engine, name: str):
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        logger.info(
+            f"{name} engine: {type(pool).__name__} size={pool.size()} "
+            f"max_overflow={pool._max_overflow} timeout={pool.timeout()} "
+            f"recycle={pool._recycle} pre_ping={pool._pre_ping} "
+            f"max_connections={pool.size() + pool._max_overflow} "
+            f"pgbouncer={settings.DB_PGBOUNCER}"
+        )
+    else:
+        logger.info(f"{name} engine: {type(pool).__name__} pgbouncer={settings.DB_PGBOUNCER}")
+
+
+# Set once anything in the current request has written to the primary, so
+# that later reads in the same request see those writes.
+_request_wrote: ContextVar[bool] = ContextVar("request_wrote", default=False)
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to `replica` when one is assigned and everything else to
+    the primary: flushes, DML, `SELECT ... FOR UPDATE`, and any statement
+    after the request has written.
+    """
+
+    replica: Engine | None = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = get_engine().sync_engine
+        writes = self._flushing or isinstance(clause, UpdateBase) or (
+            isinstance(clause, Select) and clause._for_update_arg is not None
+        )
+        if writes:
+            _request_wrote.set(True)
+            return primary
+        if self.replica is None or _request_wrote.get():
+            return primary
+        return self.replica
+
+
+# Engines are built on first use, so the web process never creates the sync
+# engine (nor imports psycopg2) and importing models stays cheap everywhere.
+_engine: AsyncEngine | None = None
+_async_session_maker: sessionmaker | None = None
+_sync_engine: Engine | None = None
+_session_local: sessionmaker | None = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            connect_args=asyncpg_connect_args(),
+            **pool_options(settings.DB_NULLPOOL, TimedAsyncQueuePool),
+        )
+        instrument_engine(_engine.sync_engine, "async")
+    return _engine
+
+
+def get_async_session_maker() -> sessionmaker:
+    global _async_session_maker
+    if _async_session_maker is None:
+        _async_session_maker = sessionmaker(
+            class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+        )
+    return _async_session_maker
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_maker() as session:
+    async with get_async_session_maker()() as session:
         yield session
 
 
-sync_engine = create_engine(settings.SYNC_DATABASE_URL)
-SessionLocal = sessionmaker(bind=sync_engine)
+def get_sync_engine() -> Engine:
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            settings.SYNC_DATABASE_URL,
+            connect_args={"connect_timeout": int(settings.DB_CONNECT_TIMEOUT)},
+            **pool_options(settings.CELERY_DB_NULLPOOL, QueuePool),
+        )
+        instrument_engine(_sync_engine, "sync")
+    return _sync_engine
+
+
+def get_session_local() -> sessionmaker:
+    global _session_local
+    if _session_local is None:
+        _session_local = sessionmaker(bind=get_sync_engine())
+    return _session_local
+
+
+def sync_engine_created() -> bool:
+    return _sync_engine is not None
+
+
+async def dispose_engines():
+    """Closes the pooled connections of every engine created so far."""
+    global _engine, _sync_engine, _session_local
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+    if _sync_engine is not None:
+        _sync_engine.dispose()
+        _sync_engine = None
+        _session_local = None
+
+
+_LAZY = {
+    "engine": get_engine,
+    "async_session_maker": get_async_session_maker,
+    "sync_engine": get_sync_engine,
+    "SessionLocal": get_session_local,
+}
+
+
+def __getattr__(name: str):
+    # Keeps `from app.config.database import engine` and friends working.
+    if name in _LAZY:
+        return _LAZY[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Base(DeclarativeBase):
     __abstract__ = True
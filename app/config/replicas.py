@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import logging
+from collections.abc import AsyncGenerator
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.common.metrics import instrument_engine
+
+from .database import (
+    TimedAsyncQueuePool,
+    _request_wrote,
+    asyncpg_connect_args,
+    get_async_session_maker,
+    pool_options,
+)
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received, so an idle primary does not look like lag.
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaSet:
+    """
+    Read replicas balanced round-robin. A background task checks each one
+    every `interval` seconds; replicas that fail the check or lag more than
+    `max_lag` seconds are skipped, and with none healthy reads go to the
+    primary. Replicas start out unhealthy until their first check passes.
+    """
+
+    def __init__(self, urls: list[str], interval: float, max_lag: float):
+        self.urls = urls
+        self.interval = interval
+        self.max_lag = max_lag
+        self.engines: list[AsyncEngine] = []
+        self._healthy: list[Engine] = []
+        self._cycle = itertools.cycle(())
+        self._task: asyncio.Task | None = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def _create_engines(self):
+        for url in self.urls:
+            engine = create_async_engine(
+                url,
+                connect_args=asyncpg_connect_args(),
+                **pool_options(settings.DB_NULLPOOL, TimedAsyncQueuePool),
+            )
+            instrument_engine(engine.sync_engine, "replica")
+            self.engines.append(engine)
+
+    def choose(self) -> Engine | None:
+        """Returns the sync engine of the next healthy replica, or None for the primary."""
+        if not self._healthy:
+            self.primary_reads += 1
+            return None
+        self.replica_reads += 1
+        return next(self._cycle)
+
+    async def _check(self, engine: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(settings.DB_CONNECT_TIMEOUT):
+                async with engine.connect() as conn:
+                    lag = (await conn.execute(LAG_SQL)).scalar_one()
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.host}:{engine.url.port} failed its health check: {e}")
+            return False
+        if lag > self.max_lag:
+            logger.warning(f"Replica {engine.url.host}:{engine.url.port} is {lag:.1f}s behind")
+            return False
+        return True
+
+    async def check_all(self):
+        results = await asyncio.gather(*(self._check(engine) for engine in self.engines))
+        healthy = [engine.sync_engine for engine, ok in zip(self.engines, results, strict=True) if ok]
+        if healthy != self._healthy:
+            logger.info(f"{len(healthy)} of {len(self.engines)} read replicas healthy")
+            self._healthy = healthy
+            self._cycle = itertools.cycle(healthy)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check_all()
+            except Exception as e:
+                logger.warning(f"Replica health check failed: {e}")
+
+    async def start(self):
+        if not self.urls or self._task is not None:
+            return
+        self._create_engines()
+        await self.check_all()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+        self.engines = []
+        self._healthy = []
+        self._cycle = itertools.cycle(())
+
+    def stats(self) -> dict:
+        return {
+            "configured": len(self.urls),
+            "healthy": len(self._healthy),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+replicas = ReplicaSet(
+    urls=[url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()],
+    interval=settings.DB_REPLICA_CHECK_INTERVAL,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+)
+
+
+def open_read_session() -> AsyncSession:
+    """A session whose reads go to a healthy replica, falling back to the primary."""
+    session = get_async_session_maker()()
+    session.sync_session.replica = replicas.choose()
+    return session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    async with open_read_session() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """
+    Scopes the "wrote to the primary" flag of `RoutingSession` to a single
+    request, even when requests share a task as with in-process ASGI clients.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _request_wrote.set(False)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_wrote.reset(token)
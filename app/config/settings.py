@@ -11,6 +11,20 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASS: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_COMMAND_TIMEOUT: float | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False  # PgBouncer in transaction pooling mode
+    DB_NULLPOOL: bool = False
+    CELERY_DB_NULLPOOL: bool = False
+    DB_REPLICA_URLS: str = ""  # comma-separated postgresql+asyncpg:// URLs
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    DB_REPLICA_MAX_LAG: float = 5.0
     
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
@@ -21,9 +35,61 @@ class Settings(BaseSettings):
     EMAIL_HOST_USER: str
     EMAIL_HOST_PASSWORD: str
     EMAIL_PORT: int
+    EMAIL_USE_TLS: bool = True
+    EMAIL_POOL_SIZE: int = 2
+    EMAIL_POOL_IDLE_TIMEOUT: int = 60
+    EMAIL_BATCH_MAX_RETRIES: int = 10
     
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
+    CELERY_METRICS_PORT: int | None = None
+    
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # "thread" or "process"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    BCRYPT_ROUNDS: int = 12  # pick with `python -m benchmarks.bcrypt_cost`
+    
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 60
+    USER_CACHE_REDIS_URL: str | None = None  # falls back to CELERY_BROKER_URL when that is Redis
+    
+    TOKEN_CACHE_SIZE: int = 10000
+    
+    REVOKED_TOKEN_FILTER_CAPACITY: int = 100000
+    REVOKED_TOKEN_FILTER_ERROR_RATE: float = 0.001
+    REVOKED_TOKEN_FILTER_REBUILD_SECONDS: int = 3600
+    
+    UNVERIFIED_USER_TTL_DAYS: int = 2
+    UNVERIFIED_PURGE_CHUNK_SIZE: int = 1000
+    UNVERIFIED_PURGE_TIME_BUDGET: float = 30.0
+    
+    EXPIRED_PURGE_CHUNK_SIZE: int = 5000
+    EXPIRED_PURGE_PAUSE: float = 0.05
+    EXPIRED_PURGE_TIME_BUDGET: float = 60.0
+    
+    VERIFY_CODE_BACKEND: str = "sql"
+    VERIFY_CODE_TTL: int = 120
+    VERIFY_CODE_REDIS_URL: str | None = None
+    
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str | None = None
+    RATE_LIMIT_MEMORY_SIZE: int = 100000
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    RATE_LIMIT_SIGNUP_IP: str = "10/minute"
+    RATE_LIMIT_SIGNUP_EMAIL: str = "3/minute"
+    RATE_LIMIT_LOGIN_IP: str = "30/minute"
+    RATE_LIMIT_LOGIN_EMAIL: str = "10/minute"
+    RATE_LIMIT_VERIFY_IP: str = "30/minute"
+    RATE_LIMIT_VERIFY_EMAIL: str = "5/minute"
+    
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_MAX_BACKOFF: int = 300
+    
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 5  # capped at DB_POOL_SIZE
 
     
     @property
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+
+from app.config.settings import settings
+
+from .models import BlacklistRefreshToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.num_bits / 8))
+        self.count = 0
+
+    def _positions(self, digest: bytes):
+        # Items are already SHA-256 digests, so their bytes are uniformly
+        # distributed and can seed the double hashing directly.
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest: bytes):
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate for the current number of items."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+class RevokedTokenFilter:
+    """
+    Bloom filter of blacklisted refresh token digests that lets the refresh
+    check answer "definitely not revoked" without touching the blacklist.
+
+    The filter is rebuilt from the non-expired blacklist rows at startup and
+    then every `rebuild_interval` seconds, which is how expired entries age
+    out. Until the first rebuild succeeds every lookup falls through to the DB.
+
+    Tokens revoked by another worker only appear here after the next rebuild.
+    That is safe because revoking a token also removes it from the
+    whitelist, which `/auth/refresh` always checks.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, rebuild_interval: int):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self._filter: BloomFilter | None = None
+        self._added_during_rebuild: list[bytes] | None = None
+        self._task: asyncio.Task | None = None
+        self.checks = 0
+        self.negatives = 0
+
+    def add(self, digest: bytes):
+        if self._filter is not None:
+            self._filter.add(digest)
+        if self._added_during_rebuild is not None:
+            self._added_during_rebuild.append(digest)
+
+    def might_contain(self, digest: bytes) -> bool:
+        self.checks += 1
+        if self._filter is not None and digest not in self._filter:
+            self.negatives += 1
+            return False
+        return True
+
+    async def rebuild(self, session_maker):
+        self._added_during_rebuild = []
+        try:
+            new_filter = BloomFilter(self.capacity, self.error_rate)
+            async with session_maker() as db:
+                result = await db.stream_scalars(
+                    select(BlacklistRefreshToken.token_hash)
+                    .where(BlacklistRefreshToken.expires_at > datetime.now(UTC))
+                    .execution_options(yield_per=10000)
+                )
+                async for digest in result:
+                    new_filter.add(digest)
+            for digest in self._added_during_rebuild:
+                new_filter.add(digest)
+            self._filter = new_filter
+        finally:
+            self._added_during_rebuild = None
+        if new_filter.count > self.capacity:
+            logger.warning(
+                f"Revoked token filter holds {new_filter.count} tokens, "
+                f"over its capacity of {self.capacity}"
+            )
+
+    async def _run(self, session_maker):
+        while True:
+            try:
+                await self.rebuild(session_maker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to rebuild revoked token filter: {e}")
+            await asyncio.sleep(self.rebuild_interval)
+
+    def start(self, session_maker):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self._filter is not None,
+            "capacity": self.capacity,
+            "size_bytes": len(self._filter.bits) if self._filter else 0,
+            "count": self._filter.count if self._filter else 0,
+            "target_error_rate": self.error_rate,
+            "estimated_error_rate": self._filter.false_positive_rate if self._filter else 1.0,
+            "checks": self.checks,
+            "negatives": self.negatives,
+        }
+
+
+revoked_tokens = RevokedTokenFilter(
+    capacity=settings.REVOKED_TOKEN_FILTER_CAPACITY,
+    error_rate=settings.REVOKED_TOKEN_FILTER_ERROR_RATE,
+    rebuild_interval=settings.REVOKED_TOKEN_FILTER_REBUILD_SECONDS,
+)
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+
+from app.config.settings import settings
+
+
+class VerifiedTokenCache:
+    """
+    LRU of already verified JWTs, keyed by the token's SHA-256 digest and
+    holding its decoded payload. Each entry is dropped at the token's own
+    `exp`, so a cached token is never accepted past its expiry.
+
+    Only tokens that passed signature, issuer and audience checks are
+    stored; the scope is still checked by the caller on every use.
+    Returned payloads are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes) -> dict | None:
+        payload = self._entries.get(digest)
+        if payload is None:
+            self.misses += 1
+            return None
+        if payload["exp"] <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return payload
+
+    def set(self, digest: bytes, payload: dict):
+        if self.maxsize <= 0 or "exp" not in payload:
+            return
+        self._entries[digest] = payload
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+verified_tokens = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_SIZE)
@@ -1,17 +1,20 @@
+import hashlib
+import time
+import uuid
 from datetime import UTC, datetime, timedelta
 
 from fastapi import HTTPException
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import delete, exists, insert, select
 
+from app.common.metrics import record_crypto
 from app.config.settings import settings
 from app.deps.db import SessionDep
 
+from .bloom import revoked_tokens
+from .cache import verified_tokens
 from .models import BlacklistRefreshToken, RefreshToken
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 def create_token(data: dict, expires_delta: timedelta, scope: str):
     to_encode = data.copy()
@@ -21,8 +24,13 @@ def create_token(data: dict, expires_delta: timedelta, scope: str):
         "scope": scope,
         "iss": "coffee-shop-api",
         "aud": "coffee-shop-users",
+        # Two tokens issued for the same user within one second would
+        # otherwise be byte-identical and collide on the unique token index.
+        "jti": uuid.uuid4().hex,
     })
+    start = time.perf_counter()
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    record_crypto("jwt_encode", time.perf_counter() - start)
     return encoded_jwt, expire
 
 def create_access_token(data: dict):
@@ -32,56 +40,75 @@ def create_refresh_token(data: dict):
     return create_token(data, timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES), scope="refresh_token")
 
 def verify_token(token: str, expected_scope: str):
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-            issuer="coffee-shop-api",
-            audience="coffee-shop-users",
-        )
-        if payload.get("scope") != expected_scope:
-            raise HTTPException(status_code=401, detail="Invalid scope")
-        return payload
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+    digest = token_digest(token)
+    payload = verified_tokens.get(digest)
+    if payload is None:
+        start = time.perf_counter()
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+                issuer="coffee-shop-api",
+                audience="coffee-shop-users",
+            )
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        record_crypto("jwt_decode", time.perf_counter() - start)
+        verified_tokens.set(digest, payload)
+    if payload.get("scope") != expected_scope:
+        raise HTTPException(status_code=401, detail="Invalid scope")
+    return payload
+
+def token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
 
 async def save_refresh_token(db: SessionDep, user_id: int, token: str, expires_at):
-    refresh = RefreshToken(user_id=user_id, token=token, expires_at=expires_at)
+    refresh = RefreshToken(user_id=user_id, token_hash=token_digest(token), expires_at=expires_at)
     db.add(refresh)
     await db.commit()
     return refresh
 
-async def get_refresh_token(db: SessionDep, token: str, type: str):
-    token_model = RefreshToken
-    if type == 'blacklist':
-        token_model = BlacklistRefreshToken
-    result = await db.execute(
-        select(token_model).where(token_model.token == token)
-    )
-    return result.scalar_one_or_none()
-
-
-async def is_token_blacklisted(db: SessionDep, token: str) -> bool:
-    result = await db.execute(
-        select(BlacklistRefreshToken).where(BlacklistRefreshToken.token == token)
+async def is_refresh_token_active(db: SessionDep, token: str) -> bool:
+    """
+    Checks that a refresh token is whitelisted and not revoked in one
+    SELECT. The blacklist is only consulted when the revoked-token filter
+    reports a possible hit.
+    """
+    digest = token_digest(token)
+    stmt = select(RefreshToken.id).where(RefreshToken.token_hash == digest)
+    if revoked_tokens.might_contain(digest):
+        stmt = stmt.where(
+            ~exists().where(BlacklistRefreshToken.token_hash == digest)
+        )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none() is not None
+
+
+async def revoke_refresh_token(db: SessionDep, token: str) -> bool:
+    """
+    Moves a refresh token from the whitelist to the blacklist in a single
+    DELETE ... RETURNING / INSERT statement. Returns False if the token was
+    not whitelisted.
+    """
+    digest = token_digest(token)
+    moved = (
+        delete(RefreshToken)
+        .where(RefreshToken.token_hash == digest)
+        .returning(RefreshToken.user_id, RefreshToken.token_hash, RefreshToken.expires_at)
+        .cte("moved")
     )
-    blacklisted = result.scalar_one_or_none()
-    return blacklisted is not None
-
-async def add_token_to_blacklist(db: SessionDep, user_id: int, token: str, expires_at: datetime):
-    blacklisted = BlacklistRefreshToken(
-        user_id=user_id,
-        token=token,
-        expires_at=expires_at
+    stmt = (
+        insert(BlacklistRefreshToken)
+        .from_select(
+            ["user_id", "token_hash", "expires_at"],
+            select(moved.c.user_id, moved.c.token_hash, moved.c.expires_at),
+        )
+        .returning(BlacklistRefreshToken.id)
     )
-    db.add(blacklisted)
+    result = await db.execute(stmt)
+    revoked = result.scalar_one_or_none() is not None
     await db.commit()
-    
-async def delete_refresh_token(db: SessionDep, token: str, type: str):
-    refresh = await get_refresh_token(db, token, type)
-    if refresh:
-        await db.delete(refresh)
-        await db.commit()
-
-
+    if revoked:
+        revoked_tokens.add(digest)
+    return revoked
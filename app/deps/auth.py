@@ -1,27 +1,26 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
 
 from app.custom_jwt.services import verify_token
-from app.deps.db import SessionDep
-from app.models.user import User
+from app.deps.db import ReadSessionDep
+from app.schemas.user import UserDetail
+from app.services.user_dao import UserDAO
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-async def get_current_user(db: SessionDep, token: str = Depends(oauth2_scheme)):
+async def get_current_user(db: ReadSessionDep, token: str = Depends(oauth2_scheme)) -> UserDetail:
     payload = verify_token(token, expected_scope="access_token")
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    q = await db.execute(select(User).where(User.id == int(user_id)))
-    user = q.scalar_one_or_none()
+    user = await UserDAO.get_detail(db, int(user_id))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
-async def admin_required(current_user: User = Depends(get_current_user)):
+async def admin_required(current_user: UserDetail = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin privileges required")
     return current_user
\ No newline at end of file
@@ -4,5 +4,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config.database import get_session
+from app.config.replicas import get_read_session
 
-SessionDep = Annotated[AsyncSession, Depends(get_session)]
\ No newline at end of file
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_session)]
@@ -0,0 +1,26 @@
+from fastapi import HTTPException, Query
+
+from app.schemas.user import UserDetail
+
+USER_FIELDS = tuple(UserDetail.model_fields)
+
+
+def user_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return, e.g. `email,status`. `id` is always included.",
+    ),
+) -> tuple[str, ...]:
+    if fields is None:
+        return USER_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(USER_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return tuple(name for name in USER_FIELDS if name in requested)
+
+
+def fields_variant(fields: tuple[str, ...]) -> str:
+    """Part of the ETag that tells sparse responses apart from full ones."""
+    return "" if fields == USER_FIELDS else "+".join(fields)
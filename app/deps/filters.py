@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from fastapi import HTTPException, Query
+
+from app.common.enums import Role, UserStatus
+from app.config.dao import Filter
+
+
+def _choice(column: str, values: list | None) -> list[Filter]:
+    if not values:
+        return []
+    if len(values) == 1:
+        return [Filter(column, "eq", values[0])]
+    return [Filter(column, "in", sorted(set(values)))]
+
+
+def _range(column: str, after: datetime | None, before: datetime | None) -> list[Filter]:
+    if after is None and before is None:
+        return []
+    if after is not None and before is not None and after >= before:
+        param = column.removesuffix("_at")
+        raise HTTPException(
+            status_code=400, detail=f"{param}_after must be earlier than {param}_before"
+        )
+    return [Filter(column, "range", (after, before))]
+
+
+def _prefix(column: str, value: str | None) -> list[Filter]:
+    return [Filter(column, "prefix", value)] if value else []
+
+
+def user_filters(
+    status: list[UserStatus] | None = Query(None, description="Repeat to match any of several statuses."),
+    role: list[Role] | None = Query(None, description="Repeat to match any of several roles."),
+    created_after: datetime | None = Query(None, description="Created at or after this time."),
+    created_before: datetime | None = Query(None, description="Created before this time."),
+    updated_after: datetime | None = Query(None, description="Updated at or after this time."),
+    updated_before: datetime | None = Query(None, description="Updated before this time."),
+    email: str | None = Query(None, max_length=255, description="Case-insensitive email prefix."),
+    first_name: str | None = Query(None, max_length=50, description="Case-insensitive first name prefix."),
+    last_name: str | None = Query(None, max_length=50, description="Case-insensitive last name prefix."),
+) -> list[Filter]:
+    return [
+        *_choice("status", status),
+        *_choice("role", role),
+        *_range("created_at", created_after, created_before),
+        *_range("updated_at", updated_after, updated_before),
+        *_prefix("email", email),
+        *_prefix("first_name", first_name),
+        *_prefix("last_name", last_name),
+    ]
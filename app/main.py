@@ -1,13 +1,73 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.common.metrics import MetricsMiddleware, register_stats
+from app.config.database import (
+    dispose_engines,
+    get_async_session_maker,
+    get_engine,
+    log_pool_config,
+)
+from app.config.replicas import ReadYourWritesMiddleware, replicas
 from app.config.settings import settings
-from app.routers import auth, users
+from app.custom_jwt.bloom import revoked_tokens
+from app.custom_jwt.cache import verified_tokens
+from app.routers import auth, health, metrics, users
+from app.services.outbox import outbox_relay
+from app.services.password import password_hasher
+from app.services.rate_limit import rate_limiter
+from app.services.user_cache import user_cache
+from app.services.verify_codes import code_store
+from app.services.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Forked first, before anything else in this process starts threads.
+    await password_hasher.start()
+    log_pool_config(get_engine().sync_engine, "web")
+    await replicas.start()
+    user_cache.start()
+    revoked_tokens.start(get_async_session_maker())
+    if settings.OUTBOX_RELAY_ENABLED:
+        outbox_relay.start(get_async_session_maker())
+    if settings.WARMUP_ENABLED:
+        warmup.start(app)
+    else:
+        warmup.ready = True
+    yield
+    await warmup.stop()
+    await outbox_relay.stop()
+    await revoked_tokens.stop()
+    await user_cache.close()
+    await code_store.close()
+    await rate_limiter.close()
+    await replicas.stop()
+    await dispose_engines()
+    password_hasher.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+
+register_stats("password_hasher", password_hasher.stats)
+register_stats("user_cache", user_cache.stats)
+register_stats("revoked_token_filter", revoked_tokens.stats)
+register_stats("verified_token_cache", verified_tokens.stats)
+register_stats("email_outbox", outbox_relay.stats)
+register_stats("rate_limiter", rate_limiter.stats)
+register_stats("db_replicas", replicas.stats)
+register_stats("warmup", warmup.stats)
+
 app.include_router(auth.router)
-app.include_router(users.router)
\ No newline at end of file
+app.include_router(users.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
@@ -13,6 +13,7 @@ from app.config.settings import settings
 from app.config.database import Base
 from app.models.user import User, VerifyCode
 from app.custom_jwt.models import RefreshToken, BlacklistRefreshToken
+from app.models.outbox import EmailOutbox
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
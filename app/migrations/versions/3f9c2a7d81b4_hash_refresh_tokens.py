@@ -0,0 +1,44 @@
+"""Store refresh tokens by sha256 digest
+
+Revision ID: 3f9c2a7d81b4
+Revises: 71e43d01a663
+Create Date: 2026-10-18 10:12:40.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d81b4'
+down_revision: Union[str, Sequence[str], None] = '71e43d01a663'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('refresh_tokens', 'blacklist_refresh_tokens')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('token_hash', sa.LargeBinary(length=32), nullable=True))
+        # sha256(bytea) is built into PostgreSQL 11+
+        op.execute(f"UPDATE {table} SET token_hash = sha256(convert_to(token, 'UTF8'))")
+        op.alter_column(table, 'token_hash', nullable=False)
+        op.create_unique_constraint(f'{table}_token_hash_key', table, ['token_hash'])
+        op.drop_constraint(f'{table}_token_key', table, type_='unique')
+        op.drop_column(table, 'token')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Digests cannot be turned back into tokens, so every outstanding
+    # session is dropped and users have to log in again.
+    for table in TABLES:
+        op.execute(f"DELETE FROM {table}")
+        op.add_column(table, sa.Column('token', sa.String(), nullable=False))
+        op.create_unique_constraint(f'{table}_token_key', table, ['token'])
+        op.drop_constraint(f'{table}_token_hash_key', table, type_='unique')
+        op.drop_column(table, 'token_hash')
@@ -0,0 +1,56 @@
+"""Add indexes for filtering the admin user list
+
+Revision ID: 6c3e8b2f4a17
+Revises: 9a6f2c4e1b38
+Create Date: 2026-10-18 16:12:47.219384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c3e8b2f4a17'
+down_revision: Union[str, Sequence[str], None] = '9a6f2c4e1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def lower_pattern(column: str) -> tuple:
+    # text_pattern_ops lets LIKE 'prefix%' use the index whatever the
+    # database collation is.
+    label = f'{column}_lower'
+    return (
+        f'ix_users_{column}_lower_pattern',
+        [sa.func.lower(sa.column(column)).label(label)],
+        {label: 'text_pattern_ops'},
+    )
+
+
+INDEXES = (
+    ('ix_users_status_id', ['status', 'id'], {}),
+    ('ix_users_role_id', ['role', 'id'], {}),
+    ('ix_users_created_at', ['created_at'], {}),
+    ('ix_users_updated_at', ['updated_at'], {}),
+    lower_pattern('email'),
+    lower_pattern('first_name'),
+    lower_pattern('last_name'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so the users table stays writable meanwhile.
+    with op.get_context().autocommit_block():
+        for name, columns, ops in INDEXES:
+            op.create_index(
+                name, 'users', columns, unique=False,
+                postgresql_concurrently=True, postgresql_ops=ops,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name='users')
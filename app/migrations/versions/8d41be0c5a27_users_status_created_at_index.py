@@ -0,0 +1,28 @@
+"""Add users (status, created_at) index
+
+Revision ID: 8d41be0c5a27
+Revises: 3f9c2a7d81b4
+Create Date: 2026-10-18 11:03:17.240951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41be0c5a27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d81b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_status_created_at', 'users', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_status_created_at', table_name='users')
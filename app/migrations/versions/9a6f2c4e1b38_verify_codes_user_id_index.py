@@ -0,0 +1,28 @@
+"""Add verify_codes user_id index
+
+Revision ID: 9a6f2c4e1b38
+Revises: e4a1b7c93d26
+Create Date: 2026-10-18 14:22:37.518904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6f2c4e1b38'
+down_revision: Union[str, Sequence[str], None] = 'e4a1b7c93d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_verify_codes_user_id'), 'verify_codes', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_verify_codes_user_id'), table_name='verify_codes')
@@ -0,0 +1,37 @@
+"""Add expires_at indexes for the expired row reaper
+
+Revision ID: c27e5f19a0d3
+Revises: 8d41be0c5a27
+Create Date: 2026-10-18 12:41:05.873112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27e5f19a0d3'
+down_revision: Union[str, Sequence[str], None] = '8d41be0c5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('refresh_tokens', 'blacklist_refresh_tokens', 'verify_codes')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large token tables stay writable meanwhile.
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                op.f(f'ix_{table}_expires_at'), table, ['expires_at'],
+                unique=False, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(op.f(f'ix_{table}_expires_at'), table_name=table)
@@ -0,0 +1,36 @@
+"""Replace the users email unique constraint with a lower(email) index
+
+Revision ID: e4a1b7c93d26
+Revises: 5b0d6e93c8f1
+Create Date: 2026-10-18 13:58:12.406519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1b7c93d26'
+down_revision: Union[str, Sequence[str], None] = '5b0d6e93c8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Emails were only lowercased on signup, so normalize anything that
+    # came in through updates. This fails on case-only duplicates, which
+    # have to be merged by hand first.
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.create_index(
+        'ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True
+    )
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -1,6 +1,15 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,9 +19,18 @@ from app.config.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_status_created_at", "status", "created_at"),
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        # Back the admin list filters; keyset pages are ordered by id.
+        Index("ix_users_status_id", "status", "id"),
+        Index("ix_users_role_id", "role", "id"),
+        Index("ix_users_created_at", "created_at"),
+        Index("ix_users_updated_at", "updated_at"),
+    )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True, autoincrement=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     first_name: Mapped[str] = mapped_column(String(50), nullable=True)
     last_name: Mapped[str] = mapped_column(String(50), nullable=True)
@@ -33,11 +51,31 @@ class User(Base):
     blacklist_refresh_tokens = relationship("BlacklistRefreshToken", back_populates="user", cascade="all, delete")
 
 
+# Prefix search on the admin user list, declared after the class to refer
+# to its columns. text_pattern_ops lets LIKE 'prefix%' use the index
+# whatever the database collation is.
+Index(
+    "ix_users_email_lower_pattern",
+    func.lower(User.email).label("email_lower"),
+    postgresql_ops={"email_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_first_name_lower_pattern",
+    func.lower(User.first_name).label("first_name_lower"),
+    postgresql_ops={"first_name_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_users_last_name_lower_pattern",
+    func.lower(User.last_name).label("last_name_lower"),
+    postgresql_ops={"last_name_lower": "text_pattern_ops"},
+)
+
+
 class VerifyCode(Base):
     __tablename__ = "verify_codes"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True, autoincrement=True)
     code: Mapped[str] = mapped_column(String(6), nullable=False)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     user = relationship("User", back_populates="verify_codes")
\ No newline at end of file
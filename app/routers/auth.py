@@ -1,22 +1,21 @@
-from datetime import UTC, datetime
-
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
 
 from app.common.enums import UserStatus
 from app.custom_jwt.services import (
-    add_token_to_blacklist,
     create_access_token,
-    delete_refresh_token,
-    get_refresh_token,
-    is_token_blacklisted,
+    is_refresh_token_active,
+    revoke_refresh_token,
     verify_token,
 )
 from app.deps.db import SessionDep
 from app.schemas.auth import CreateUser, LoginSchema, TokenReponse, VerifyCodeSchema
 from app.schemas.user import UserDetail
 from app.services.auth import generate_tokens
+from app.services.rate_limit import rate_limiter
 from app.services.user import create_user
-from app.services.user_dao import UserDAO, VerifyCodeDAO
+from app.services.user_cache import user_cache
+from app.services.user_dao import UserDAO
+from app.services.verify_codes import code_store
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
@@ -28,7 +27,8 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
     description="""Register a new user with email, password, and 
     optional first and last name. Returns the created user."""
 )
-async def signup(data: CreateUser, db: SessionDep) -> UserDetail:
+async def signup(data: CreateUser, request: Request, db: SessionDep) -> UserDetail:
+    await rate_limiter.check("signup", request, data.email)
     new_user = await create_user(data, db)
     return new_user
 
@@ -38,15 +38,18 @@ async def signup(data: CreateUser, db: SessionDep) -> UserDetail:
     summary="Verify user account",
     description="Verify a user's account using the verification code sent to their email."
 )
-async def verify_account(data: VerifyCodeSchema, db: SessionDep):
-    code = await VerifyCodeDAO.get_code(db, data.code, data.email)
-    if not code:
+async def verify_account(data: VerifyCodeSchema, request: Request, db: SessionDep):
+    await rate_limiter.check("verify", request, data.email)
+    user_id = await code_store.consume(db, data.email, data.code)
+    if user_id is None:
+        raise HTTPException(status_code=400, detail="Invalid or expired code")
+    user = await UserDAO.get_by_id(db, user_id)
+    if user is None:
+        # The Redis and memory stores outlive the users their codes were issued for.
         raise HTTPException(status_code=400, detail="Invalid code")
-    if code.expires_at < datetime.now(UTC):
-        raise HTTPException(status_code=400, detail="Code expired")
-    user = await UserDAO.get_by_id(db, code.user_id)
     user.status = UserStatus.VERIFIED
     await db.commit()
+    await user_cache.invalidate(user.id)
     return {"message": "Account verified successfully"}
 
 @router.post(
@@ -54,8 +57,11 @@ async def verify_account(data: VerifyCodeSchema, db: SessionDep):
     summary="User login",
     description="Authenticate user and return access and refresh tokens."
 )
-async def login(data: LoginSchema, db: SessionDep) -> TokenReponse:
-    tokens = await generate_tokens(data, db)
+async def login(
+    data: LoginSchema, request: Request, db: SessionDep, background_tasks: BackgroundTasks
+) -> TokenReponse:
+    await rate_limiter.check("login", request, data.email)
+    tokens = await generate_tokens(data, db, background_tasks)
     return tokens
 
 @router.post(
@@ -64,17 +70,11 @@ async def login(data: LoginSchema, db: SessionDep) -> TokenReponse:
     description="Refresh the access token using a valid refresh token."
 )
 async def refresh(token: str, db: SessionDep):
-    if await is_token_blacklisted(db, token):
-        raise HTTPException(status_code=401, detail="Token has been revoked")
-
-    db_token = await get_refresh_token(db, token, type="whitelist")
-    if not db_token:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
-    if db_token.expires_at < datetime.now(UTC):
-        await delete_refresh_token(db, token, type="whitelist")
-        raise HTTPException(status_code=401, detail="Refresh token expired")
-    
+    # Signature, expiry and scope are checked before touching the database.
     payload = verify_token(token, expected_scope="refresh_token")
+    if not await is_refresh_token_active(db, token):
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
     user_id = payload.get("sub")
     new_access_token, _ = create_access_token({"sub": user_id})
     return {"access_token": new_access_token}
@@ -85,11 +85,9 @@ async def refresh(token: str, db: SessionDep):
     description="Logout the user and revoke their refresh token by adding it to the blacklist."
 )
 async def logout(token: str, db: SessionDep):
-    payload = verify_token(token, expected_scope="refresh_token")
-    db_token = await get_refresh_token(db, token, type="whitelist")
-    user_id = int(payload.get("sub"))
-    await add_token_to_blacklist(db, user_id, token, db_token.expires_at)
-    await delete_refresh_token(db, token, type="whitelist")
+    verify_token(token, expected_scope="refresh_token")
+    if not await revoke_refresh_token(db, token):
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
     return {"message": "Logged out successfully"}
 
 
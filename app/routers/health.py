@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.warmup import warmup
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    description="""Returns 200 once the worker has warmed up (database 
+    connections, bcrypt, JWT and serializers) and 503 until then or while 
+    shutting down.""",
+)
+async def ready():
+    if not warmup.ready:
+        return JSONResponse({"status": "starting"}, status_code=503)
+    return {"status": "ready"}
@@ -1,50 +1,224 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from typing import Annotated
 
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+
+from app.common.conditional import (
+    has_conditions,
+    is_not_modified,
+    not_modified,
+    quote_etag,
+    row_etag,
+    rows_etag,
+    validator_headers,
+)
+from app.common.responses import FastJSONResponse, dumps
+from app.config.dao import Filter, is_unique_violation
+from app.config.replicas import open_read_session
 from app.deps.auth import admin_required, get_current_user
-from app.deps.db import SessionDep
-from app.models.user import User
-from app.schemas.user import UserDetail, UserUpdate
+from app.deps.db import ReadSessionDep, SessionDep
+from app.deps.fields import fields_variant, user_fields
+from app.deps.filters import user_filters
+from app.schemas.auth import AdminCreateUser
+from app.schemas.user import (
+    UserBulkDeleted,
+    UserBulkUpdate,
+    UserDetail,
+    UserPage,
+    UserUpdate,
+)
+from app.services.password import hash_password, password_hasher
+from app.services.user_cache import user_cache
 from app.services.user_dao import UserDAO
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+BULK_LIMIT = 1000
+
 
 @router.get(
     "/me",
     response_model=UserDetail,
     summary="Get current user",
-    description="Retrieve the currently authenticated user's details."
+    description="""Retrieve the currently authenticated user's details. 
+    Use `fields` to return only some of them. Supports `If-None-Match` and 
+    `If-Modified-Since`."""
 )
-async def get_me(current_user: User = Depends(get_current_user)):
-    return current_user
+async def get_me(
+    request: Request,
+    current_user: UserDetail = Depends(get_current_user),
+    fields: tuple[str, ...] = Depends(user_fields),
+):
+    etag = row_etag(current_user.id, current_user.updated_at, fields_variant(fields))
+    if is_not_modified(request, etag, current_user.updated_at):
+        return not_modified(etag, current_user.updated_at)
+    return FastJSONResponse(
+        current_user.model_dump(include=set(fields)),
+        headers=validator_headers(etag, current_user.updated_at),
+    )
 
 
 @router.get(
     "/",
-    summary="List all users (admin only)",
-    description="Retrieve a list of all users. Accessible only to admin users."
+    summary="List users (admin only)",
+    description="""Retrieve a page of users ordered by ID. Pass the returned 
+    `next_after` as `after` to get the next page. Filter by `status` and 
+    `role`, by `created_*`/`updated_*` time ranges and by `email`, 
+    `first_name` or `last_name` prefix. Use `fields` to select only some 
+    columns. Supports `If-None-Match`. Accessible only to admin users."""
 )
 async def list_users(
+    request: Request,
+    db: ReadSessionDep,
+    admin: UserDetail = Depends(admin_required),
+    limit: int = Query(50, ge=1, le=500),
+    after: int | None = Query(None, ge=0),
+    fields: tuple[str, ...] = Depends(user_fields),
+    filters: list[Filter] = Depends(user_filters),
+) -> UserPage:
+    variant = fields_variant(fields)
+    # Pages have no Last-Modified: a deleted row would not move it forward.
+    if has_conditions(request):
+        etag = quote_etag(await UserDAO.get_page_digest(db, limit + 1, after, filters), variant)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    # Requested fields come first so the head of each row zips straight into
+    # a dict; updated_at is always selected for the ETag.
+    columns = fields + tuple(name for name in ("updated_at",) if name not in fields)
+    rows = await UserDAO.get_page_rows(db, columns, limit + 1, after, filters)
+    next_after = rows[limit - 1].id if len(rows) > limit else None
+    return FastJSONResponse(
+        {
+            "items": [dict(zip(fields, row[:len(fields)], strict=True)) for row in rows[:limit]],
+            "next_after": next_after,
+        },
+        headers=validator_headers(rows_etag(rows, variant)),
+    )
+
+@router.get(
+    "/stream",
+    summary="Stream all users (admin only)",
+    description="""Stream every user as newline-delimited JSON, fetching rows 
+    through a server-side cursor. Use `fields` to select only some columns. 
+    Accessible only to admin users."""
+)
+async def stream_users(
+    admin: UserDetail = Depends(admin_required),
+    fields: tuple[str, ...] = Depends(user_fields),
+):
+    async def rows():
+        # The request-scoped session is closed before a streaming body is sent,
+        # so the cursor needs a session of its own.
+        async with open_read_session() as db:
+            async for row in UserDAO.stream_all(db, columns=fields):
+                yield dumps(dict(zip(fields, row, strict=True))) + b"\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+@router.post(
+    "/bulk",
+    status_code=201,
+    summary="Create users in bulk (admin only)",
+    description="""Create up to 1000 users in one transaction. Fails as a whole 
+    if any email is already in use. Accessible only to admin users."""
+)
+async def bulk_create_users(
+    data: Annotated[list[AdminCreateUser], Body(min_length=1, max_length=BULK_LIMIT)],
+    db: SessionDep,
+    admin: UserDetail = Depends(admin_required)
+) -> list[UserDetail]:
+    # Keep at most one hash per worker in flight so a large batch does not
+    # fill the hasher queue and starve logins.
+    semaphore = asyncio.Semaphore(password_hasher.workers)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await hash_password(password)
+
+    hashed_passwords = await asyncio.gather(*(hash_one(item.password) for item in data))
+    try:
+        users = await UserDAO.create_many(db, data, hashed_passwords)
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=400, detail="Email already in use. ") from None
+    return [UserDetail.model_validate(user) for user in users]
+
+@router.patch(
+    "/bulk",
+    summary="Update users in bulk (admin only)",
+    description="""Partially update up to 1000 users in one transaction. 
+    Fails as a whole if any ID does not exist. Accessible only to admin users."""
+)
+async def bulk_update_users(
+    data: Annotated[list[UserBulkUpdate], Body(min_length=1, max_length=BULK_LIMIT)],
     db: SessionDep,
-    admin: User = Depends(admin_required)
+    admin: UserDetail = Depends(admin_required)
 ) -> list[UserDetail]:
-    users = await UserDAO.get_all(db)
-    return users
+    rows = [item.model_dump(exclude_unset=True) for item in data]
+    try:
+        users = await UserDAO.update_many(db, rows)
+    except IntegrityError as e:
+        await db.rollback()
+        if not is_unique_violation(e):
+            raise
+        raise HTTPException(status_code=400, detail="Email already in use. ") from None
+    if users is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return [UserDetail.model_validate(user) for user in users]
+
+@router.delete(
+    "/bulk",
+    summary="Delete users in bulk (admin only)",
+    description="""Delete up to 1000 users by ID in one statement and return 
+    the IDs that were deleted. Accessible only to admin users."""
+)
+async def bulk_delete_users(
+    db: SessionDep,
+    ids: Annotated[list[int], Query(min_length=1, max_length=BULK_LIMIT)],
+    admin: UserDetail = Depends(admin_required)
+) -> UserBulkDeleted:
+    deleted = await UserDAO.delete_many(db, ids)
+    return UserBulkDeleted(deleted=deleted)
 
 @router.get(
     "/{id}",
     summary="Get user by ID (admin only)",
-    description="Retrieve a user's details by their ID. Accessible only to admin users."
+    description="""Retrieve a user's details by their ID. Use `fields` to 
+    return only some of them. Supports `If-None-Match` and `If-Modified-Since`. 
+    Accessible only to admin users."""
 )
 async def get_user_by_id(
     id: int,
-    db: SessionDep,
-    admin: User = Depends(admin_required)
+    request: Request,
+    db: ReadSessionDep,
+    admin: UserDetail = Depends(admin_required),
+    fields: tuple[str, ...] = Depends(user_fields),
 ) -> UserDetail:
-    user = await UserDAO.get_by_id(db, id)
+    variant = fields_variant(fields)
+    user = await user_cache.get(id)
+    if user is None and has_conditions(request):
+        # Check the validator alone before loading the full row.
+        updated_at = await UserDAO.get_updated_at(db, id)
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        etag = row_etag(id, updated_at, variant)
+        if is_not_modified(request, etag, updated_at):
+            return not_modified(etag, updated_at)
+    if user is None:
+        user = await UserDAO.get_detail(db, id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    etag = row_etag(user.id, user.updated_at, variant)
+    if is_not_modified(request, etag, user.updated_at):
+        return not_modified(etag, user.updated_at)
+    return FastJSONResponse(
+        user.model_dump(include=set(fields)),
+        headers=validator_headers(etag, user.updated_at),
+    )
 
 @router.patch(
     "/{id}",
@@ -57,7 +231,7 @@ async def update_user(
     id: int,
     data: UserUpdate,
     db: SessionDep,
-    current_user: User = Depends(get_current_user)
+    current_user: UserDetail = Depends(get_current_user)
 ):
     user = await UserDAO.get_by_id(db, id)
     if not user:
@@ -78,7 +252,7 @@ async def update_user(
 async def delete_user(
     id: int,
     db: SessionDep,
-    admin: User = Depends(admin_required)
+    admin: UserDetail = Depends(admin_required)
 ):
     user = await UserDAO.get_by_id(db, id)
     if not user:
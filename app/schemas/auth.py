@@ -1,11 +1,18 @@
 from pydantic import BaseModel, EmailStr
 
+from app.common.enums import Role, UserStatus
+
 
 class CreateUser(BaseModel):
     email: EmailStr
     password: str
     first_name: str | None = None
     last_name: str | None = None
+
+
+class AdminCreateUser(CreateUser):
+    status: UserStatus = UserStatus.VERIFIED
+    role: Role = Role.USER
     
 
 class VerifyCodeSchema(BaseModel):
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, EmailStr
 
 from app.common.enums import Role, UserStatus
@@ -10,6 +12,7 @@ class UserDetail(BaseModel):
     last_name: str | None = None
     status: UserStatus
     role: Role
+    updated_at: datetime
     
     class Config:
         from_attributes = True
@@ -18,4 +21,21 @@ class UserDetail(BaseModel):
 class UserUpdate(BaseModel):
     email: EmailStr = None
     first_name: str | None = None
-    last_name: str | None = None
\ No newline at end of file
+    last_name: str | None = None
+
+
+class UserBulkUpdate(UserUpdate):
+    id: int
+    # Optional but not nullable, like `email`: an explicit null is rejected
+    # instead of reaching the NOT NULL columns.
+    status: UserStatus = None
+    role: Role = None
+
+
+class UserBulkDeleted(BaseModel):
+    deleted: list[int]
+
+
+class UserPage(BaseModel):
+    items: list[UserDetail]
+    next_after: int | None = None
@@ -1,27 +1,54 @@
-from fastapi import HTTPException, status
+import logging
+
+from fastapi import BackgroundTasks, HTTPException, status
 
 from app.common.enums import UserStatus
+from app.config.database import get_async_session_maker
 from app.custom_jwt.services import (
     create_access_token,
     create_refresh_token,
-    pwd_context,
     save_refresh_token,
 )
 from app.deps.db import SessionDep
 from app.schemas.auth import LoginSchema, TokenReponse
+from app.services.password import hash_password, needs_rehash, verify_password
 from app.services.user_dao import UserDAO
 
+logger = logging.getLogger(__name__)
+
+
+async def rehash_password(user_id: int, password: str, old_hash: str):
+    """
+    Stores `password` hashed at the current BCRYPT_ROUNDS in place of
+    `old_hash`. Runs after the login response is sent; if the hasher is
+    busy or anything fails, the next login tries again.
+    """
+    try:
+        new_hash = await hash_password(password)
+        async with get_async_session_maker()() as db:
+            replaced = await UserDAO.replace_password_hash(db, user_id, old_hash, new_hash)
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Could not rehash the password of user {user_id}: {e}")
+        return
+    if replaced:
+        logger.info(f"Rehashed the password of user {user_id}")
+
 
-async def generate_tokens(data: LoginSchema, db: SessionDep) -> TokenReponse:
-    user = await UserDAO.get_one_by_filters(db, email=data.email)
+async def generate_tokens(
+    data: LoginSchema, db: SessionDep, background_tasks: BackgroundTasks
+) -> TokenReponse:
+    user = await UserDAO.get_by_email(db, data.email)
     
-    if not user or not pwd_context.verify(data.password, user.password):
+    if not user or not await verify_password(data.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     elif user.status == UserStatus.UNVERIFIED:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Your account is not verified. Please verify your email to proceed."
         )
+    if needs_rehash(user.password):
+        background_tasks.add_task(rehash_password, user.id, data.password, user.password)
     access_token, _ = create_access_token({"sub": str(user.id), "role": user.role})
     refresh_token, expire = create_refresh_token({"sub": str(user.id)})
     await save_refresh_token(db, user.id, refresh_token, expire)
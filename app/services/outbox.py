@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, func, select, update
+
+from app.config.settings import settings
+from app.models.outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _publish(messages: list[dict]):
+    # Imported lazily so the web process only loads Celery once there is
+    # something to publish.
+    from app.tasks.send_mail_tasks import send_email_batch_task
+
+    send_email_batch_task.delay(messages)
+
+
+class OutboxRelay:
+    """
+    Publishes pending outbox rows to Celery in batches.
+
+    Rows are claimed with `FOR UPDATE SKIP LOCKED`, so several web workers
+    can run a relay against the same table. A batch is deleted in the same
+    transaction that claimed it once Celery has accepted it; if publishing
+    fails the rows stay and are retried with exponential backoff. From
+    there `send_email_batch_task` owns delivery: it is acknowledged late and
+    retries itself with the messages not yet sent. A crash between
+    publishing and committing sends the batch twice, which is the usual
+    at-least-once trade-off of an outbox.
+
+    `notify()` wakes the relay right after a commit that added rows, so the
+    poll interval only bounds the delay for rows written by other workers
+    and for retries.
+    """
+
+    def __init__(self, batch_size: int, poll_interval: float, max_backoff: int):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.published = 0
+        self.batches = 0
+        self.failures = 0
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def relay_once(self, session_maker) -> int:
+        """Publishes one batch and returns how many rows it sent."""
+        async with session_maker() as db:
+            rows = (await db.scalars(
+                select(EmailOutbox)
+                .where(EmailOutbox.next_attempt_at <= func.now())
+                .order_by(EmailOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not rows:
+                return 0
+
+            ids = [row.id for row in rows]
+            messages = [
+                {"to_email": row.to_email, "subject": row.subject, "body": row.body}
+                for row in rows
+            ]
+            try:
+                await asyncio.to_thread(_publish, messages)
+            except Exception as e:
+                self.failures += 1
+                attempts = max(row.attempts for row in rows) + 1
+                delay = min(self.max_backoff, 2 ** attempts)
+                logger.warning(
+                    f"Failed to publish {len(ids)} outbox emails "
+                    f"(attempt {attempts}), retrying in {delay}s: {e}"
+                )
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(EmailOutbox.id.in_(ids))
+                    .values(
+                        attempts=EmailOutbox.attempts + 1,
+                        next_attempt_at=datetime.now(UTC) + timedelta(seconds=delay),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                return 0
+
+            await db.execute(
+                delete(EmailOutbox)
+                .where(EmailOutbox.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        self.published += len(ids)
+        self.batches += 1
+        return len(ids)
+
+    async def _run(self, session_maker):
+        while True:
+            self._wakeup.clear()
+            try:
+                # Keep draining while full batches come back.
+                while await self.relay_once(session_maker) == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Outbox relay failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    def start(self, session_maker):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(session_maker))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "published": self.published,
+            "batches": self.batches,
+            "failures": self.failures,
+        }
+
+
+outbox_relay = OutboxRelay(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL,
+    max_backoff=settings.OUTBOX_MAX_BACKOFF,
+)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.common.metrics import record_crypto
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# With min and max pinned to the target cost, `needs_update` flags hashes
+# made at any other cost, higher or lower.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+def _hash(password: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    hashed = pwd_context.hash(password)
+    return hashed, time.perf_counter() - start
+
+
+def _verify(password: str, hashed: str) -> tuple[bool, float]:
+    start = time.perf_counter()
+    valid = pwd_context.verify(password, hashed)
+    return valid, time.perf_counter() - start
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification in a bounded worker pool so that
+    the event loop is never blocked. When more than `workers + queue_size`
+    operations are pending, new ones are rejected with 503.
+    """
+
+    def __init__(self, kind: str, workers: int, queue_size: int):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = workers + queue_size
+        self._executor: Executor | None = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def start(self):
+        """
+        Creates the pool up front, from the lifespan, so the first login does
+        not pay for it. Process workers are only forked on submit, so one
+        no-op per worker starts them all now rather than from a request.
+        """
+        executor = self._get_executor()
+        if self.kind == "process":
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(executor, int) for _ in range(self.workers)))
+
+    async def _submit(self, operation: str, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning(f"Password hasher is saturated ({self._pending} pending)")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+        record_crypto(operation, elapsed)
+        self.completed += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("bcrypt_hash", _hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._submit("bcrypt_verify", _verify, password, hashed)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._pending - self.workers)
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "in_flight": min(self._pending, self.workers),
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_time": self.total_time / self.completed if self.completed else 0.0,
+            "max_time": self.max_time,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await password_hasher.verify(password, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True when `hashed` was made with another scheme or cost than BCRYPT_ROUNDS."""
+    return pwd_context.needs_update(hashed)
@@ -0,0 +1,194 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import HTTPException, Request, status
+
+from app.config.settings import settings
+from app.services.user_dao import normalize_email
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate-limit:"
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Token bucket kept in a hash of {tokens, ts}. Returns 0 if the request is
+# allowed, otherwise the milliseconds until a token is available.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return wait
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    capacity: int
+    rate: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Limit | None":
+        """Parses limits such as `10/minute`; an empty value disables the limit."""
+        if not value:
+            return None
+        count, _, period = value.partition("/")
+        if period not in PERIODS:
+            raise ValueError(f"Unknown rate limit period in {value!r}")
+        try:
+            count = int(count)
+        except ValueError:
+            raise ValueError(f"Rate limit count in {value!r} is not an integer") from None
+        # A zero count would make the refill rate zero; an empty value is
+        # the way to turn a limit off.
+        if count <= 0:
+            raise ValueError(f"Rate limit count in {value!r} must be positive")
+        return cls(capacity=count, rate=count / PERIODS[period])
+
+
+class MemoryBuckets:
+    """Token buckets of this process only, the oldest evicted past `maxsize`."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - ts) * limit.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / limit.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+    async def close(self):
+        pass
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker, updated atomically by a Lua script."""
+
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self._redis: aioredis.Redis | None = None
+        self._script = None
+
+    async def take(self, key: str, limit: Limit) -> float:
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url)
+            self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        try:
+            wait_ms = await self._script(
+                keys=[f"{KEY_PREFIX}{key}"], args=[limit.capacity, limit.rate]
+            )
+        except redis.RedisError as e:
+            # Failing open: an outage of the limiter must not lock users out.
+            logger.warning(f"Rate limiter redis call failed: {e}")
+            return 0.0
+        return wait_ms / 1000
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+class RateLimiter:
+    """
+    Per-route token-bucket limits keyed by client IP and by email.
+
+    Handlers call `check` before touching the database or the password
+    hasher, so rejected requests cost one bucket update and nothing else.
+    """
+
+    SCOPES = ("ip", "email")
+
+    def __init__(self, buckets, limits: dict[tuple[str, str], Limit], trust_forwarded: bool):
+        self.buckets = buckets
+        self.limits = limits
+        self.trust_forwarded = trust_forwarded
+        self.enabled = True
+        self.checks = 0
+        self.rejected = 0
+
+    def client_ip(self, request: Request) -> str:
+        if self.trust_forwarded:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check(self, route: str, request: Request, email: str | None = None):
+        if not self.enabled:
+            return
+        self.checks += 1
+        values = {"ip": self.client_ip(request), "email": email and normalize_email(email)}
+        wait = 0.0
+        for scope in self.SCOPES:
+            limit = self.limits.get((route, scope))
+            if limit is None or not values[scope]:
+                continue
+            wait = max(wait, await self.buckets.take(f"{route}:{scope}:{values[scope]}", limit))
+        if wait > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def close(self):
+        await self.buckets.close()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "checks": self.checks,
+            "rejected": self.rejected,
+        }
+
+
+def create_rate_limiter() -> RateLimiter:
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        buckets = MemoryBuckets(settings.RATE_LIMIT_MEMORY_SIZE)
+    elif settings.RATE_LIMIT_BACKEND == "redis":
+        buckets = RedisBuckets(settings.RATE_LIMIT_REDIS_URL or settings.CELERY_BROKER_URL)
+    else:
+        raise ValueError(f"Unknown rate limit backend: {settings.RATE_LIMIT_BACKEND}")
+
+    limits = {}
+    for route in ("signup", "login", "verify"):
+        for scope in RateLimiter.SCOPES:
+            limit = Limit.parse(getattr(settings, f"RATE_LIMIT_{route.upper()}_{scope.upper()}"))
+            if limit is not None:
+                limits[(route, scope)] = limit
+    limiter = RateLimiter(buckets, limits, settings.RATE_LIMIT_TRUST_FORWARDED)
+    limiter.enabled = settings.RATE_LIMIT_ENABLED
+    return limiter
+
+
+rate_limiter = create_rate_limiter()
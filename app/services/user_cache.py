@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+import orjson
+import redis
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+from app.schemas.user import UserDetail
+
+logger = logging.getLogger(__name__)
+
+# Versioned so entries written before a schema change are simply missed.
+KEY_PREFIX = "user-cache:v2:"
+INVALIDATE_CHANNEL = "user-cache:invalidate"
+
+
+class UserCache:
+    """
+    Two-tier cache of `UserDetail` records keyed by user id:
+    - an in-process LRU with a TTL
+    - a shared Redis tier
+
+    Writes invalidate both tiers and publish the ids on a pub/sub channel so
+    that every other worker drops its local copy as well. Without Redis
+    there is no such channel, so the cache keeps nothing at all rather than
+    serve another worker's stale copy for up to `ttl` seconds.
+
+    Loads that finish within `settle` seconds of an invalidation are not
+    cached, since they may have read a replica that has not caught up yet.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, redis_url: str | None = None, settle: float = 0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.settle = settle
+        self._local: OrderedDict[int, tuple[float, UserDetail]] = OrderedDict()
+        # Loads in flight per id, and how often each of those ids was
+        # invalidated meanwhile, so a load that raced with a write does not
+        # put the stale row back into the cache. Both drop an id once its
+        # last load finishes.
+        self._loads: dict[int, int] = {}
+        self._epochs: dict[int, int] = {}
+        self._invalidated_at: OrderedDict[int, float] = OrderedDict()
+        self._redis: aioredis.Redis | None = None
+        self._listener: asyncio.Task | None = None
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _get_redis(self) -> aioredis.Redis | None:
+        if self.redis_url and self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    def _get_local(self, user_id: int) -> UserDetail | None:
+        entry = self._local.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._local[user_id]
+            return None
+        self._local.move_to_end(user_id)
+        return user
+
+    def _set_local(self, user: UserDetail):
+        if not self.redis_url:
+            return
+        self._local[user.id] = (time.monotonic() + self.ttl, user)
+        self._local.move_to_end(user.id)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    def _evict_local(self, user_ids):
+        for user_id in user_ids:
+            self._local.pop(user_id, None)
+            if user_id in self._loads:
+                self._epochs[user_id] = self._epochs.get(user_id, 0) + 1
+            if self.settle:
+                self._invalidated_at[user_id] = time.monotonic()
+                self._invalidated_at.move_to_end(user_id)
+        # Kept in invalidation order, so the ones past `settle` are at the front.
+        now = time.monotonic()
+        while self._invalidated_at:
+            user_id, at = next(iter(self._invalidated_at.items()))
+            if now - at < self.settle:
+                break
+            del self._invalidated_at[user_id]
+
+    async def get(self, user_id: int) -> UserDetail | None:
+        user = self._get_local(user_id)
+        if user is not None:
+            self.local_hits += 1
+            return user
+        client = self._get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(f"{KEY_PREFIX}{user_id}")
+            except redis.RedisError as e:
+                logger.warning(f"User cache redis read failed: {e}")
+                raw = None
+            if raw is not None:
+                user = UserDetail.model_validate(orjson.loads(raw))
+                self._set_local(user)
+                self.redis_hits += 1
+                return user
+        self.misses += 1
+        return None
+
+    async def set(self, user) -> UserDetail:
+        detail = UserDetail.model_validate(user, from_attributes=True)
+        self._set_local(detail)
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.set(
+                    f"{KEY_PREFIX}{detail.id}",
+                    orjson.dumps(detail.model_dump(mode="json")),
+                    ex=self.ttl,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"User cache redis write failed: {e}")
+        return detail
+
+    async def get_or_load(
+        self, user_id: int, loader: Callable[[], Awaitable]
+    ) -> UserDetail | None:
+        cached = await self.get(user_id)
+        if cached is not None:
+            return cached
+        self._loads[user_id] = self._loads.get(user_id, 0) + 1
+        epoch = self._epochs.get(user_id, 0)
+        try:
+            user = await loader()
+            raced = self._epochs.get(user_id, 0) != epoch
+        finally:
+            self._loads[user_id] -= 1
+            if not self._loads[user_id]:
+                del self._loads[user_id]
+                self._epochs.pop(user_id, None)
+        if user is None:
+            return None
+        settling = time.monotonic() - self._invalidated_at.get(user_id, float("-inf")) < self.settle
+        if raced or settling:
+            return UserDetail.model_validate(user, from_attributes=True)
+        return await self.set(user)
+
+    async def invalidate(self, *user_ids: int):
+        self._evict_local(user_ids)
+        client = self._get_redis()
+        if client is None or not user_ids:
+            return
+        try:
+            await client.delete(*(f"{KEY_PREFIX}{user_id}" for user_id in user_ids))
+            await client.publish(INVALIDATE_CHANNEL, orjson.dumps(list(user_ids)))
+        except redis.RedisError as e:
+            logger.warning(f"User cache invalidation failed: {e}")
+
+    def invalidate_sync(self, *user_ids: int):
+        """Invalidation entry point for sync code such as Celery tasks."""
+        self._evict_local(user_ids)
+        if not self.redis_url or not user_ids:
+            return
+        client = redis.Redis.from_url(self.redis_url)
+        try:
+            client.delete(*(f"{KEY_PREFIX}{user_id}" for user_id in user_ids))
+            client.publish(INVALIDATE_CHANNEL, orjson.dumps(list(user_ids)))
+        except redis.RedisError as e:
+            logger.warning(f"User cache invalidation failed: {e}")
+        finally:
+            client.close()
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = self._get_redis().pubsub()
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                # Anything cached while we were disconnected may be stale.
+                self._local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._evict_local(orjson.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"User cache listener disconnected: {e}")
+                self._local.clear()
+                await asyncio.sleep(1)
+
+    def start(self):
+        if not self.redis_url:
+            logger.warning("User cache is off: no Redis to share invalidations between workers")
+            return
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+        }
+
+
+def cache_redis_url() -> str | None:
+    """USER_CACHE_REDIS_URL, falling back to the Celery broker when that is Redis."""
+    if settings.USER_CACHE_REDIS_URL:
+        return settings.USER_CACHE_REDIS_URL
+    if settings.CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+        return settings.CELERY_BROKER_URL
+    return None
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL,
+    redis_url=cache_redis_url(),
+    settle=settings.DB_REPLICA_MAX_LAG if settings.DB_REPLICA_URLS else 0,
+)
@@ -1,36 +1,134 @@
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    Text,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.common.enums import Role, UserStatus
 from app.config.dao import BaseDAO
 from app.deps.db import SessionDep
+from app.models.outbox import EmailOutbox
 from app.models.user import User, VerifyCode
-from app.schemas.auth import CreateUser
+from app.schemas.auth import AdminCreateUser, CreateUser
+from app.schemas.user import UserDetail
+from app.services.user_cache import user_cache
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
 
 
 class UserDAO(BaseDAO):
     model = User
+    # Everything `UserDetail` needs, and notably not the password hash.
+    DETAIL_COLUMNS = tuple(UserDetail.model_fields)
+    # Each pairs with an index on `users`, see migration 6c3e8b2f4a17.
+    filterable = {
+        "status": ("eq", "in"),
+        "role": ("eq", "in"),
+        "created_at": ("range",),
+        "updated_at": ("range",),
+        "email": ("prefix",),
+        "first_name": ("prefix",),
+        "last_name": ("prefix",),
+    }
     
     @classmethod
-    async def create(cls, db: SessionDep, data: CreateUser, hashed_pass: str) -> User:
-        new_user = User(
-            email=data.email.lower().strip(),
-            password=hashed_pass,
-            first_name=data.first_name,
-            last_name=data.last_name,
-            status=UserStatus.UNVERIFIED,
-            role=Role.USER,
+    async def get_detail(cls, db: SessionDep, user_id: int) -> UserDetail | None:
+        return await user_cache.get_or_load(
+            user_id, lambda: cls.get_row_by_id(db, user_id, cls.DETAIL_COLUMNS)
         )
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-        return new_user
+    
+    @classmethod
+    async def get_updated_at(cls, db: SessionDep, user_id: int) -> datetime | None:
+        """Reads only the validator column, for conditional requests that miss the cache."""
+        result = await db.execute(select(User.updated_at).where(User.id == user_id))
+        return result.scalar_one_or_none()
+    
+    @classmethod
+    async def get_by_email(cls, db: SessionDep, email: str) -> User | None:
+        # Matches the expression of the unique `lower(email)` index.
+        result = await db.execute(
+            select(User).where(func.lower(User.email) == normalize_email(email))
+        )
+        return result.scalar_one_or_none()
+    
+    @classmethod
+    async def signup(
+        cls,
+        db: SessionDep,
+        data: CreateUser,
+        hashed_pass: str,
+        subject: str,
+        body: str,
+        code: str | None = None,
+        expires_at: datetime | None = None,
+    ) -> UserDetail | None:
+        """
+        Inserts an unverified user together with its welcome email and, when
+        `code` is given, its `verify_codes` row in a single statement.
+        Returns None if the email is taken. Does not commit.
+        """
+        new_user = (
+            pg_insert(User)
+            .values(
+                email=normalize_email(data.email),
+                password=hashed_pass,
+                first_name=data.first_name,
+                last_name=data.last_name,
+                status=UserStatus.UNVERIFIED,
+                role=Role.USER,
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(
+                User.id, User.email, User.first_name, User.last_name, User.status, User.role,
+                User.updated_at,
+            )
+            .cte("new_user")
+        )
+        new_email = insert(EmailOutbox).from_select(
+            ["to_email", "subject", "body", "attempts"],
+            select(
+                new_user.c.email,
+                literal(subject, String),
+                literal(body, Text),
+                literal(0, Integer),
+            ),
+        ).cte("new_email")
+        ctes = [new_email]
+        if code is not None:
+            ctes.append(insert(VerifyCode).from_select(
+                ["code", "user_id", "expires_at"],
+                select(
+                    literal(code, String),
+                    new_user.c.id,
+                    literal(expires_at, DateTime(timezone=True)),
+                ),
+            ).cte("new_code"))
+
+        result = await db.execute(select(new_user).add_cte(*ctes))
+        row = result.one_or_none()
+        return UserDetail.model_validate(row) if row else None
     
     @classmethod
     async def update(cls, db: SessionDep, user: User, data: dict) -> User:
+        if data.get("email"):
+            data["email"] = normalize_email(data["email"])
         for field, value in data.items():
             setattr(user, field, value)
         await db.commit()
+        await user_cache.invalidate(user.id)
         await db.refresh(user)
         return user
     
@@ -38,33 +136,96 @@ class UserDAO(BaseDAO):
     async def delete(cls, db: SessionDep, user: User):
         await db.delete(user)
         await db.commit()
+        await user_cache.invalidate(user.id)
+    
+    @classmethod
+    async def create_many(
+        cls, db: SessionDep, data: list[AdminCreateUser], hashed_passwords: list[str]
+    ) -> list[User]:
+        users = await cls.bulk_create(db, [
+            {
+                "email": normalize_email(item.email),
+                "password": hashed_pass,
+                "first_name": item.first_name,
+                "last_name": item.last_name,
+                "status": item.status,
+                "role": item.role,
+            }
+            for item, hashed_pass in zip(data, hashed_passwords, strict=True)
+        ])
+        await db.commit()
+        return users
+    
+    @classmethod
+    async def replace_password_hash(
+        cls, db: SessionDep, user_id: int, old_hash: str, new_hash: str
+    ) -> bool:
+        """
+        Swaps the stored hash only while it is still `old_hash`, so a password
+        changed in the meantime is kept. `updated_at` is left alone since the
+        hash is not part of any response. Does not commit.
+        """
+        q = await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password == old_hash)
+            .values(password=new_hash, updated_at=User.updated_at)
+        )
+        return q.rowcount == 1
+    
+    @classmethod
+    async def update_many(cls, db: SessionDep, rows: list[dict]) -> list[User] | None:
+        """
+        Updates every row in one transaction and returns the updated users.
+        Returns None without committing if any of the ids does not exist.
+        """
+        ids = [row["id"] for row in rows]
+        for row in rows:
+            if row.get("email"):
+                row["email"] = normalize_email(row["email"])
+        try:
+            await cls.bulk_update(db, rows)
+        except StaleDataError:
+            await db.rollback()
+            return None
+        # Bulk UPDATE bypasses the identity map, so reload what it changed.
+        db.expire_all()
+        users = await cls.get_many_by_ids(db, ids)
+        if len(users) != len(set(ids)):
+            await db.rollback()
+            return None
+        await db.commit()
+        await user_cache.invalidate(*ids)
+        return users
+    
+    @classmethod
+    async def delete_many(cls, db: SessionDep, ids: list[int]) -> list[int]:
+        deleted_ids = await cls.bulk_delete(db, ids)
+        await db.commit()
+        await user_cache.invalidate(*deleted_ids)
+        return deleted_ids
 
 
 class VerifyCodeDAO:
     
     @staticmethod
-    async def create(db: SessionDep, code: str, user_id: int, expires_at):
-        verify_code = VerifyCode(
-            code=code,
-            user_id=user_id,
-            expires_at=expires_at
+    async def consume(db: SessionDep, email: str, code: str) -> int | None:
+        """
+        Deletes a matching unexpired code and returns its user id. Does not
+        commit, so the delete lands together with the status change.
+        """
+        user_id = (
+            select(User.id)
+            .where(func.lower(User.email) == normalize_email(email))
+            .scalar_subquery()
         )
-        db.add(verify_code)
-        await db.commit()
-
-    @staticmethod
-    async def get_code(db: SessionDep, code: str, user_email: str):
         result = await db.execute(
-            select(VerifyCode)
-            .join(VerifyCode.user)
-            .options(joinedload(VerifyCode.user))
-            .where(VerifyCode.code == code, User.email == user_email)
+            delete(VerifyCode)
+            .where(
+                VerifyCode.user_id == user_id,
+                VerifyCode.code == code,
+                VerifyCode.expires_at > func.now(),
+            )
+            .returning(VerifyCode.user_id)
+            .execution_options(synchronize_session=False)
         )
-        return result.scalar_one_or_none()
-
-    @staticmethod
-    async def delete(db: SessionDep, code_id: int):
-        code_obj = await db.get(VerifyCode, code_id)
-        if code_obj:
-            await db.delete(code_obj)
-            await db.commit()
+        return result.scalars().first()
@@ -0,0 +1,151 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+
+import redis.asyncio as aioredis
+
+from app.config.settings import settings
+from app.deps.db import SessionDep
+from app.services.user_dao import VerifyCodeDAO, normalize_email
+
+KEY_PREFIX = "verify-code:"
+
+# Deletes the key only if it holds the submitted code, so a wrong guess
+# does not burn the code. Values are stored as "<code>:<user_id>".
+CONSUME_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return false
+end
+local sep = string.find(value, ':', 1, true)
+if string.sub(value, 1, sep - 1) ~= ARGV[1] then
+    return false
+end
+redis.call('DEL', KEYS[1])
+return string.sub(value, sep + 1)
+"""
+
+
+class VerifyCodeStore(ABC):
+    """
+    Where verification codes live between signup and `/auth/verify`.
+
+    `save` runs inside the signup transaction, before it commits. `consume`
+    atomically checks a code and removes it, returning the user id it was
+    issued for, or None if the code is wrong or has expired.
+    """
+
+    in_database = False
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def save(self, email: str, user_id: int, code: str):
+        ...
+
+    @abstractmethod
+    async def consume(self, db: SessionDep, email: str, code: str) -> int | None:
+        ...
+
+    def expires_at(self) -> datetime:
+        return datetime.now(UTC) + timedelta(seconds=self.ttl)
+
+    async def close(self):  # noqa: B027  optional hook, only the Redis store holds a client
+        pass
+
+
+class SQLVerifyCodeStore(VerifyCodeStore):
+    """Keeps codes in the `verify_codes` table; expired rows are reaped by Celery beat."""
+
+    in_database = True
+
+    async def save(self, email: str, user_id: int, code: str):
+        pass
+
+    async def consume(self, db: SessionDep, email: str, code: str) -> int | None:
+        return await VerifyCodeDAO.consume(db, email, code)
+
+
+class RedisVerifyCodeStore(VerifyCodeStore):
+    """Keeps codes under `verify-code:<email>` keys that Redis expires by itself."""
+
+    def __init__(self, ttl: int, redis_url: str):
+        super().__init__(ttl)
+        self.redis_url = redis_url
+        self._redis: aioredis.Redis | None = None
+        self._consume = None
+
+    def _get_redis(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url)
+            self._consume = self._redis.register_script(CONSUME_SCRIPT)
+        return self._redis
+
+    async def save(self, email: str, user_id: int, code: str):
+        await self._get_redis().set(
+            f"{KEY_PREFIX}{normalize_email(email)}", f"{code}:{user_id}", ex=self.ttl
+        )
+
+    async def consume(self, db: SessionDep, email: str, code: str) -> int | None:
+        self._get_redis()
+        user_id = await self._consume(
+            keys=[f"{KEY_PREFIX}{normalize_email(email)}"], args=[code]
+        )
+        return int(user_id) if user_id is not None else None
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+class MemoryVerifyCodeStore(VerifyCodeStore):
+    """Process-local store for tests and single-process development."""
+
+    def __init__(self, ttl: int):
+        super().__init__(ttl)
+        self._codes: OrderedDict[str, tuple[float, str, int]] = OrderedDict()
+
+    async def save(self, email: str, user_id: int, code: str):
+        email = normalize_email(email)
+        now = time.monotonic()
+        self._codes[email] = (now + self.ttl, code, user_id)
+        self._codes.move_to_end(email)
+        # Every code lives `ttl` seconds, so the expired ones are at the front.
+        while True:
+            expires_at, _, _ = next(iter(self._codes.values()))
+            if expires_at >= now:
+                break
+            self._codes.popitem(last=False)
+
+    async def consume(self, db: SessionDep, email: str, code: str) -> int | None:
+        email = normalize_email(email)
+        entry = self._codes.get(email)
+        if entry is None:
+            return None
+        expires_at, saved_code, user_id = entry
+        if expires_at < time.monotonic():
+            del self._codes[email]
+            return None
+        if saved_code != code:
+            return None
+        del self._codes[email]
+        return user_id
+
+
+def create_code_store(backend: str) -> VerifyCodeStore:
+    if backend == "sql":
+        return SQLVerifyCodeStore(settings.VERIFY_CODE_TTL)
+    if backend == "redis":
+        return RedisVerifyCodeStore(
+            settings.VERIFY_CODE_TTL,
+            settings.VERIFY_CODE_REDIS_URL or settings.CELERY_BROKER_URL,
+        )
+    if backend == "memory":
+        return MemoryVerifyCodeStore(settings.VERIFY_CODE_TTL)
+    raise ValueError(f"Unknown verify code backend: {backend}")
+
+
+code_store = create_code_store(settings.VERIFY_CODE_BACKEND)
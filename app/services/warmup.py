@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+import typing
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import text
+
+from app.common.conditional import EPOCH
+from app.common.enums import Role, UserStatus
+from app.common.responses import dumps
+from app.config.database import get_engine
+from app.config.settings import settings
+from app.custom_jwt.cache import verified_tokens
+from app.custom_jwt.services import create_access_token, verify_token
+from app.schemas.auth import TokenReponse
+from app.schemas.user import UserBulkDeleted, UserDetail, UserPage
+from app.services.password import password_hasher
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_USER = UserDetail(
+    id=0,
+    email="warm-up@example.com",
+    status=UserStatus.UNVERIFIED,
+    role=Role.USER,
+    updated_at=EPOCH,
+)
+# One instance of every response model, used to run route serializers once.
+SAMPLES = {
+    UserDetail: SAMPLE_USER,
+    UserPage: UserPage(items=[SAMPLE_USER]),
+    UserBulkDeleted: UserBulkDeleted(deleted=[0]),
+    TokenReponse: TokenReponse(access_token="", refresh_token=""),
+}
+
+
+def sample_for(annotation):
+    if typing.get_origin(annotation) is list:
+        (item,) = typing.get_args(annotation)
+        sample = sample_for(item)
+        return None if sample is None else [sample]
+    return SAMPLES.get(annotation)
+
+
+class Warmup:
+    """
+    Pays the first-request costs of a new worker in the background right
+    after startup: opens up to `db_connections` pool connections, loads the
+    bcrypt backend in every hasher worker, encodes and decodes one JWT and
+    runs each route's response serializer once. `ready` turns true when it
+    is done; a failing step is logged and does not hold readiness back.
+    """
+
+    def __init__(self, db_connections: int):
+        self.db_connections = db_connections
+        self.ready = False
+        self.timings: dict[str, float] = {}
+        self._task: asyncio.Task | None = None
+
+    async def _db(self):
+        if settings.DB_NULLPOOL:
+            return
+        engine = get_engine()
+
+        async def connect():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        # Held concurrently so each one is a distinct pooled connection.
+        count = min(self.db_connections, settings.DB_POOL_SIZE)
+        await asyncio.gather(*(connect() for _ in range(count)))
+
+    async def _password(self):
+        hashed = await password_hasher.hash("warm-up")
+        await asyncio.gather(
+            *(password_hasher.verify("warm-up", hashed) for _ in range(password_hasher.workers))
+        )
+
+    async def _jwt(self):
+        token, _ = create_access_token({"sub": "0", "role": Role.USER.value})
+        verify_token(token, expected_scope="access_token")
+        verified_tokens.clear()
+
+    async def _serializers(self, app: FastAPI):
+        for route in app.routes:
+            if not isinstance(route, APIRoute) or route.response_field is None:
+                continue
+            sample = sample_for(route.response_field.type_)
+            if sample is None:
+                logger.debug(f"No warm-up sample for the response of {route.path}")
+                continue
+            content = await serialize_response(
+                field=route.response_field,
+                response_content=sample,
+                is_coroutine=asyncio.iscoroutinefunction(route.endpoint),
+            )
+            dumps(content)
+
+    async def run(self, app: FastAPI):
+        steps = {
+            "db": self._db,
+            "password": self._password,
+            "jwt": self._jwt,
+            "serializers": lambda: self._serializers(app),
+        }
+        for name, step in steps.items():
+            start = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed: {e}")
+            self.timings[name] = time.perf_counter() - start
+        self.ready = True
+        logger.info(f"Warm-up done in {sum(self.timings.values()):.3f}s")
+
+    def start(self, app: FastAPI):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(app))
+
+    async def stop(self):
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, **{f"{name}_seconds": t for name, t in self.timings.items()}}
+
+
+warmup = Warmup(db_connections=settings.WARMUP_DB_CONNECTIONS)
@@ -1,14 +1,21 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
+from app.config.database import get_sync_engine, log_pool_config, sync_engine_created
 from app.config.settings import settings
 
-from app.models.user import User, VerifyCode
-from app.custom_jwt.models import RefreshToken, BlacklistRefreshToken
-
+# Task modules are imported by the worker through `include`, so importing
+# this module (e.g. to publish a task from the web process) stays cheap.
 celery_app = Celery(
     "tasks",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.tasks.send_mail_tasks",
+        "app.tasks.check_user_task",
+        "app.tasks.cleanup_tasks",
+        "app.tasks.metrics",
+    ],
 )
 
 celery_app.conf.beat_schedule = {
@@ -16,6 +23,15 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.check_user_task.delete_unverified_users",
         "schedule": crontab(minute="*"),
     },
+    "delete-expired-rows": {
+        "task": "app.tasks.cleanup_tasks.delete_expired_rows",
+        "schedule": crontab(minute="*/10"),
+    },
 }
 
-from app.tasks import send_mail_tasks, check_user_task
\ No newline at end of file
+@worker_process_init.connect
+def _init_db_pool(**kwargs):
+    # Forked children must not reuse the parent's pooled connections.
+    if sync_engine_created():
+        get_sync_engine().dispose(close=False)
+    log_pool_config(get_sync_engine(), "celery")
@@ -1,29 +1,72 @@
+import logging
+import time
 from datetime import UTC, datetime, timedelta
 
-from app.config.database import SessionLocal
+from sqlalchemy import delete, select
+
+from app.config.database import get_session_local
+from app.config.settings import settings
 from app.models.user import User, UserStatus
+from app.services.user_cache import user_cache
 
 from .celery import celery_app
+from .locks import task_lock
+from .metrics import UNVERIFIED_USERS_DELETED
+
+logger = logging.getLogger(__name__)
 
 
 @celery_app.task(name="app.tasks.check_user_task.delete_unverified_users")
 def delete_unverified_users():
-    print("Deleting started")
-    db = SessionLocal()
+    budget = settings.UNVERIFIED_PURGE_TIME_BUDGET
+    with task_lock("delete_unverified_users", timeout=budget + 60) as acquired:
+        if not acquired:
+            return {"skipped": True}
+        return _delete_unverified_users(budget)
+
+
+def _delete_unverified_users(budget: float) -> dict:
+    deleted = 0
+    batches = 0
+    complete = False
+    start = time.monotonic()
+    db = get_session_local()()
     try:
-        cutoff_date = datetime.now(UTC) - timedelta(days=2)
-        users_to_delete = db.query(User).filter(
-            User.status == UserStatus.UNVERIFIED,
-            User.created_at < cutoff_date
-        ).all()
-        deleted_count = len(users_to_delete)
-        for user in users_to_delete:
-            db.delete(user)
-        db.commit()
-        print(f"Deleted {deleted_count} unverified users")
+        cutoff_date = datetime.now(UTC) - timedelta(days=settings.UNVERIFIED_USER_TTL_DAYS)
+        chunk = (
+            select(User.id)
+            .where(User.status == UserStatus.UNVERIFIED, User.created_at < cutoff_date)
+            .limit(settings.UNVERIFIED_PURGE_CHUNK_SIZE)
+            .scalar_subquery()
+        )
+        stmt = delete(User).where(User.id.in_(chunk)).returning(User.id)
+        while time.monotonic() - start < budget:
+            # verify_codes and tokens go with the user through ON DELETE CASCADE
+            deleted_ids = db.execute(
+                stmt, execution_options={"synchronize_session": False}
+            ).scalars().all()
+            db.commit()
+            if deleted_ids:
+                batches += 1
+                deleted += len(deleted_ids)
+                UNVERIFIED_USERS_DELETED.inc(len(deleted_ids))
+                user_cache.invalidate_sync(*deleted_ids)
+            if len(deleted_ids) < settings.UNVERIFIED_PURGE_CHUNK_SIZE:
+                complete = True
+                break
     except Exception as e:
         db.rollback()
-        print(f"Error deleting unverified users: {e}")
+        logger.error(f"Error deleting unverified users: {e}")
         raise
     finally:
         db.close()
+
+    result = {
+        "skipped": False,
+        "deleted": deleted,
+        "batches": batches,
+        "complete": complete,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+    logger.info(f"Deleted unverified users: {result}")
+    return result
@@ -0,0 +1,78 @@
+import logging
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select
+
+from app.config.database import get_session_local
+from app.config.settings import settings
+from app.custom_jwt.models import BlacklistRefreshToken, RefreshToken
+from app.models.user import VerifyCode
+
+from .celery import celery_app
+from .locks import task_lock
+from .metrics import EXPIRED_ROWS_DELETED
+
+logger = logging.getLogger(__name__)
+
+# A blacklisted token past its exp would be rejected by JWT validation
+# anyway, so its blacklist entry can go as soon as it expires.
+EXPIRING_MODELS = (RefreshToken, BlacklistRefreshToken, VerifyCode)
+
+
+@celery_app.task(name="app.tasks.cleanup_tasks.delete_expired_rows")
+def delete_expired_rows():
+    budget = settings.EXPIRED_PURGE_TIME_BUDGET
+    with task_lock("delete_expired_rows", timeout=budget + 60) as acquired:
+        if not acquired:
+            return {"skipped": True}
+        return _delete_expired_rows(budget)
+
+
+def _delete_expired_rows(budget: float) -> dict:
+    chunk_size = settings.EXPIRED_PURGE_CHUNK_SIZE
+    deleted = {model.__tablename__: 0 for model in EXPIRING_MODELS}
+    complete = True
+    start = time.monotonic()
+    now = datetime.now(UTC)
+    db = get_session_local()()
+    try:
+        for model in EXPIRING_MODELS:
+            # Short transactions over SKIP LOCKED chunks never wait on, or
+            # hold locks against, rows that requests are working with.
+            chunk = (
+                select(model.id)
+                .where(model.expires_at < now)
+                .limit(chunk_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            stmt = delete(model).where(model.id.in_(chunk))
+            while True:
+                if time.monotonic() - start >= budget:
+                    complete = False
+                    break
+                count = db.execute(
+                    stmt, execution_options={"synchronize_session": False}
+                ).rowcount
+                db.commit()
+                deleted[model.__tablename__] += count
+                EXPIRED_ROWS_DELETED.labels(model.__tablename__).inc(count)
+                if count < chunk_size:
+                    break
+                time.sleep(settings.EXPIRED_PURGE_PAUSE)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error deleting expired rows: {e}")
+        raise
+    finally:
+        db.close()
+
+    result = {
+        "skipped": False,
+        "deleted": deleted,
+        "complete": complete,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+    logger.info(f"Deleted expired rows: {result}")
+    return result
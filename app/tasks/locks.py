@@ -0,0 +1,28 @@
+import logging
+from contextlib import contextmanager
+
+import redis
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def task_lock(name: str, timeout: float):
+    """
+    Non-blocking Redis lock that keeps overlapping runs of a periodic task
+    from piling up. Yields False when another run already holds it.
+    """
+    lock = redis.Redis.from_url(settings.CELERY_BROKER_URL).lock(f"lock:{name}", timeout=timeout)
+    if not lock.acquire(blocking=False):
+        logger.info(f"Previous {name} run is still in progress")
+        yield False
+        return
+    try:
+        yield True
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            logger.warning(f"{name} lock expired before the run finished")
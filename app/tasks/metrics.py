@@ -0,0 +1,64 @@
+import os
+import time
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_ready,
+)
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+
+from app.config.settings import settings
+
+TASKS = Counter("celery_tasks_total", "Celery tasks finished by final state", ["task", "state"])
+TASK_DURATION = Histogram("celery_task_duration_seconds", "Celery task run time", ["task"])
+EMAILS_SENT = Counter("celery_emails_total", "Emails handed to SMTP by result", ["result"])
+UNVERIFIED_USERS_DELETED = Counter(
+    "celery_unverified_users_deleted_total", "Unverified users purged by the beat task"
+)
+
+EXPIRED_ROWS_DELETED = Counter(
+    "celery_expired_rows_deleted_total", "Expired token and code rows reclaimed", ["table"]
+)
+
+_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs):
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, state=None, **kwargs):
+    start = _started.pop(task_id, None)
+    if start is not None:
+        TASK_DURATION.labels(task.name).observe(time.perf_counter() - start)
+    TASKS.labels(task.name, state or "UNKNOWN").inc()
+
+
+@worker_ready.connect
+def _start_metrics_server(**kwargs):
+    # With the prefork pool tasks run in child processes, so their metrics
+    # are only visible when PROMETHEUS_MULTIPROC_DIR is set for the worker.
+    if not settings.CELERY_METRICS_PORT:
+        return
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -1,31 +1,101 @@
 import logging
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import time
+
+from celery.signals import worker_process_shutdown
 
 from app.config.settings import settings
 
 from .celery import celery_app
+from .metrics import EMAILS_SENT
+from .smtp import build_message, close_smtp_pool, get_smtp_pool, is_connection_error
 
 logger = logging.getLogger(__name__)
 
+
+@worker_process_shutdown.connect
+def _close_smtp_pool(**kwargs):
+    close_smtp_pool()
+
+
 @celery_app.task(name="app.tasks.send_mail_tasks.send_email_task")
 def send_email_task(to_email: str, subject: str, body: str):
     logger.info(f"Starting send_email_task to {to_email}")
-    msg = MIMEMultipart()
-    msg["From"] = settings.EMAIL_HOST_USER
-    msg["To"] = to_email
-    msg["Subject"] = subject
-
-    msg.attach(MIMEText(body, "plain"))
+    pool = get_smtp_pool()
+    pool.close_idle()
     try:
-        logger.info(f"Coooodeeeee {body}")
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-            server.starttls()
-            server.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
-            server.sendmail(settings.EMAIL_HOST_USER, to_email, msg.as_string())
-
-        logger.info(f"Email successfully sent to {to_email} {body}")
+        pool.send_message(build_message(to_email, subject, body))
+        EMAILS_SENT.labels("sent").inc()
+        logger.info(f"Email successfully sent to {to_email}")
     except Exception as e:
+        EMAILS_SENT.labels("failed").inc()
         logger.error(f"Failed to send email to {to_email}. Error: {e}")
         raise
+
+
+@celery_app.task(
+    name="app.tasks.send_mail_tasks.send_email_batch_task",
+    bind=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    max_retries=settings.EMAIL_BATCH_MAX_RETRIES,
+)
+def send_email_batch_task(self, messages: list[dict]):
+    """
+    Sends many emails over a single pooled SMTP session.
+    Each message is a dict with `to_email`, `subject` and `body` keys.
+
+    Only refused recipients and rejected message data fail a single email.
+    On any other error the task is retried with the messages not yet sent,
+    backing off like the outbox relay, and fails once the retries run out.
+    The message is acknowledged only when the task finishes, so a batch
+    whose worker died is delivered again.
+    """
+    pool = get_smtp_pool()
+    pool.close_idle()
+    sent = 0
+    failed = []
+    start = time.perf_counter()
+    pending = list(messages)
+    retried = False
+    try:
+        while pending:
+            try:
+                with pool.connection() as server:
+                    while pending:
+                        message = pending[0]
+                        try:
+                            pool.send(server, build_message(**message))
+                            sent += 1
+                        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                            logger.error(f"Failed to send email to {message['to_email']}. Error: {e}")
+                            failed.append(message["to_email"])
+                        pending.pop(0)
+                        retried = False
+            except Exception as e:
+                # The session broke mid-batch: carry on over a fresh connection,
+                # but give up if that fails too before anything else is sent.
+                if retried or not is_connection_error(e):
+                    raise
+                retried = True
+    except Exception as e:
+        if self.request.retries >= self.max_retries:
+            logger.error(f"Failed to send {len(pending)} emails, giving up. Error: {e}")
+            failed.extend(message["to_email"] for message in pending)
+            raise
+        countdown = min(settings.OUTBOX_MAX_BACKOFF, 2 ** (self.request.retries + 1))
+        logger.warning(f"Failed to send {len(pending)} emails, retrying in {countdown}s. Error: {e}")
+        raise self.retry(args=(pending,), exc=e, countdown=countdown) from e
+    finally:
+        EMAILS_SENT.labels("sent").inc(sent)
+        EMAILS_SENT.labels("failed").inc(len(failed))
+
+    elapsed = time.perf_counter() - start
+    result = {
+        "sent": sent,
+        "failed": failed,
+        "elapsed": round(elapsed, 3),
+        "per_second": round(sent / elapsed, 2) if elapsed else 0.0,
+    }
+    logger.info(f"Email batch finished: {result}")
+    return result
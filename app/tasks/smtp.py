@@ -0,0 +1,170 @@
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(to_email: str, subject: str, body: str) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = settings.EMAIL_HOST_USER
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    True if `error` means the session itself is gone, so it must be closed
+    and a new connection may succeed. `SMTPException` subclasses `OSError`,
+    so the other SMTP errors (refused recipients, failed login, ...) are
+    told apart first: they leave a healthy session behind.
+    """
+    if isinstance(error, smtplib.SMTPException):
+        return isinstance(error, smtplib.SMTPServerDisconnected | smtplib.SMTPConnectError)
+    return isinstance(error, OSError)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` logged-in SMTP sessions per worker process so that
+    consecutive emails skip the TCP connect, STARTTLS and login round trips.
+    Sessions idle for longer than `idle_timeout` seconds are closed.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        use_tls: bool = True,
+        size: int = 2,
+        idle_timeout: int = 60,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.opened += 1
+        return server
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except smtplib.SMTPException:
+            server.close()
+        except OSError:
+            pass
+
+    def _acquire(self) -> smtplib.SMTP:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            if now - last_used < self.idle_timeout:
+                return server
+            self._quit(server)
+        return self._connect()
+
+    def _release(self, server: smtplib.SMTP):
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._quit(server)
+
+    @contextmanager
+    def connection(self):
+        server = self._acquire()
+        try:
+            yield server
+        except Exception as e:
+            if is_connection_error(e):
+                server.close()
+            else:
+                self._release(server)
+            raise
+        self._release(server)
+
+    def send(self, server: smtplib.SMTP, msg: MIMEMultipart):
+        server.sendmail(msg["From"], msg["To"], msg.as_string())
+
+    def send_message(self, msg: MIMEMultipart):
+        """Sends over a pooled session, reconnecting once if it went stale."""
+        try:
+            with self.connection() as server:
+                self.send(server, msg)
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            logger.info("Pooled SMTP session was dropped, reconnecting")
+            with self.connection() as server:
+                self.send(server, msg)
+
+    def close_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s, last_used in self._idle if now - last_used >= self.idle_timeout]
+            self._idle = [(s, t) for s, t in self._idle if now - t < self.idle_timeout]
+        for server in expired:
+            self._quit(server)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._quit(server)
+
+
+_pool: SMTPConnectionPool | None = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    # Created lazily so every forked worker process gets its own sockets.
+    global _pool
+    if _pool is None:
+        _pool = SMTPConnectionPool(
+            host=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            user=settings.EMAIL_HOST_USER,
+            password=settings.EMAIL_HOST_PASSWORD,
+            use_tls=settings.EMAIL_USE_TLS,
+            size=settings.EMAIL_POOL_SIZE,
+            idle_timeout=settings.EMAIL_POOL_IDLE_TIMEOUT,
+        )
+    return _pool
+
+
+def close_smtp_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close_all()
+        _pool = None
@@ -0,0 +1,339 @@
+"""
+End-to-end latency benchmark for the auth and user flows.
+
+In-process, through httpx's ASGI transport (needs only the database from .env):
+
+    python -m benchmarks.api_latency --concurrency 32 --duration 30 --output run.json
+
+Against a running server started with `python -m benchmarks.serve`:
+
+    python -m benchmarks.api_latency --base-url http://127.0.0.1:8000
+
+Auth rate limits are turned off in-process unless `--rate-limit` is passed,
+since every simulated client shares one IP. The same goes for `benchmarks.serve`.
+
+Compare with an earlier run and fail on p95 regressions above 10%:
+
+    python -m benchmarks.api_latency --compare baseline.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import AsyncExitStack
+from datetime import UTC, datetime
+
+import httpx
+from sqlalchemy import update
+
+ROUTES = {
+    "signup": "POST /auth/signup",
+    "verify": "POST /auth/verify",
+    "login": "POST /auth/login",
+    "refresh": "POST /auth/refresh",
+    "me": "GET /users/me",
+    "list_users": "GET /users/",
+    "list_users_fields": "GET /users/?fields=id,email",
+}
+DEFAULT_MIX = "signup=1,verify=1,login=2,refresh=3,me=10,list_users=1"
+PASSWORD = "bench-password"
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {name!r}, expected one of {list(ROUTES)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Bench:
+    def __init__(self, client: httpx.AsyncClient, args):
+        self.client = client
+        self.args = args
+        self.in_process = args.base_url is None
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.unverified: deque[str] = deque()
+        self.sessions: list[dict] = []
+        self.admin: dict | None = None
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def new_email(self) -> str:
+        self.counter += 1
+        return f"bench-{self.run_id}-{self.counter}@example.com"
+
+    async def timed(self, name: str, method: str, url: str, record: bool = True, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - start
+        if record:
+            self.latencies[name].append(elapsed)
+            if response is None or response.status_code >= 400:
+                self.errors[name] += 1
+        return response
+
+    async def get_code(self, email: str, wait: float = 2.0) -> str | None:
+        # Codes go out through the outbox relay, so they can lag the signup.
+        deadline = time.perf_counter() + wait
+        while True:
+            if self.in_process:
+                from .stubs import sent_codes
+                code = sent_codes.get(email)
+            else:
+                response = await self.client.get(f"/__bench__/codes/{email}")
+                code = response.json()["code"] if response.status_code == 200 else None
+            if code is not None or time.perf_counter() >= deadline:
+                return code
+            await asyncio.sleep(0.02)
+
+    async def signup(self, record: bool = True) -> str:
+        email = self.new_email()
+        response = await self.timed(
+            "signup", "POST", "/auth/signup", record,
+            json={"email": email, "password": PASSWORD},
+        )
+        if response is not None and response.status_code == 201:
+            self.unverified.append(email)
+        return email
+
+    async def verify(self, record: bool = True) -> str | None:
+        if not self.unverified:
+            await self.signup(record=False)
+        if not self.unverified:
+            return None
+        email = self.unverified.popleft()
+        code = await self.get_code(email)
+        response = await self.timed(
+            "verify", "POST", "/auth/verify", record,
+            json={"email": email, "code": code or "000000"},
+        )
+        if response is not None and response.status_code == 200:
+            return email
+        return None
+
+    async def login(self, email: str | None = None, record: bool = True) -> dict | None:
+        session = None
+        if email is None:
+            session = random.choice(self.sessions)
+            email = session["email"]
+        response = await self.timed(
+            "login", "POST", "/auth/login", record,
+            json={"email": email, "password": PASSWORD},
+        )
+        if response is None or response.status_code != 200:
+            return None
+        tokens = response.json()
+        if session is None:
+            session = {"email": email}
+        session.update(tokens)
+        return session
+
+    async def refresh(self):
+        session = random.choice(self.sessions)
+        await self.timed(
+            "refresh", "POST", "/auth/refresh", params={"token": session["refresh_token"]}
+        )
+
+    async def me(self):
+        session = random.choice(self.sessions)
+        await self.timed(
+            "me", "GET", "/users/me",
+            headers={"Authorization": f"Bearer {session['access_token']}"},
+        )
+
+    async def list_users(self):
+        await self.timed(
+            "list_users", "GET", "/users/", params={"limit": 50},
+            headers={"Authorization": f"Bearer {self.admin['access_token']}"},
+        )
+
+    async def list_users_fields(self):
+        await self.timed(
+            "list_users_fields", "GET", "/users/", params={"limit": 50, "fields": "id,email"},
+            headers={"Authorization": f"Bearer {self.admin['access_token']}"},
+        )
+
+    async def create_session(self) -> dict | None:
+        await self.signup(record=False)
+        email = await self.verify(record=False)
+        return await self.login(email, record=False) if email else None
+
+    async def promote_admin(self, email: str):
+        from app.common.enums import Role
+        from app.config.database import get_async_session_maker
+        from app.models.user import User
+
+        async with get_async_session_maker()() as db:
+            await db.execute(update(User).where(User.email == email).values(role=Role.ADMIN))
+            await db.commit()
+
+    async def setup(self):
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+
+        async def one():
+            async with semaphore:
+                return await self.create_session()
+
+        sessions = await asyncio.gather(*(one() for _ in range(self.args.users)))
+        self.sessions = [s for s in sessions if s]
+        if not self.sessions:
+            raise SystemExit("Setup failed: could not create any verified user")
+
+        await self.signup(record=False)
+        admin_email = await self.verify(record=False)
+        await self.promote_admin(admin_email)
+        self.admin = await self.login(admin_email, record=False)
+
+    async def run(self, mix: dict[str, float]):
+        names = list(mix)
+        weights = [mix[name] for name in names]
+        deadline = time.perf_counter() + self.args.duration
+        remaining = self.args.requests
+
+        async def worker():
+            nonlocal remaining
+            while time.perf_counter() < deadline:
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                op = random.choices(names, weights)[0]
+                await getattr(self, op)()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            routes[ROUTES[name]] = {
+                "count": len(values),
+                "errors": self.errors[name],
+                "throughput": round(len(values) / elapsed, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p50_ms": round(percentile(values, 50) * 1000, 3),
+                "p95_ms": round(percentile(values, 95) * 1000, 3),
+                "p99_ms": round(percentile(values, 99) * 1000, 3),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "meta": {
+                "timestamp": datetime.now(UTC).isoformat(),
+                "target": self.args.base_url or "asgi",
+                "concurrency": self.args.concurrency,
+                "users": self.args.users,
+                "mix": self.args.mix,
+                "elapsed_s": round(elapsed, 3),
+            },
+            "total": {
+                "count": total,
+                "errors": sum(self.errors.values()),
+                "throughput": round(total / elapsed, 2),
+            },
+            "routes": routes,
+        }
+
+
+def print_report(result: dict):
+    print(f"{'route':<30}{'count':>8}{'err':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in sorted(result["routes"].items()):
+        print(
+            f"{route:<30}{stats['count']:>8}{stats['errors']:>6}{stats['throughput']:>10}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+    total = result["total"]
+    print(f"total: {total['count']} requests, {total['errors']} errors, {total['throughput']} req/s")
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> bool:
+    """Prints p95 changes per route; returns False if any regressed past `threshold`."""
+    ok = True
+    for route, stats in sorted(result["routes"].items()):
+        old = baseline["routes"].get(route)
+        if not old or not old["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / old["p95_ms"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{route:<30} p95 {old['p95_ms']:>9} -> {stats['p95_ms']:>9} ms ({change:+.1%}){flag}")
+    return ok
+
+
+async def main(args) -> int:
+    mix = parse_mix(args.mix)
+    async with AsyncExitStack() as stack:
+        if args.base_url is None:
+            from app.main import app
+            from app.services.rate_limit import rate_limiter
+
+            from .stubs import stub_email_tasks
+
+            stub_email_tasks()
+            # Every simulated client shares one IP and a few emails.
+            rate_limiter.enabled = args.rate_limit
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+        else:
+            transport = None
+            base_url = args.base_url
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout)
+        )
+        bench = Bench(client, args)
+        await bench.setup()
+        elapsed = await bench.run(mix)
+
+    result = bench.report(elapsed)
+    print_report(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(result, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run the mix for")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--users", type=int, default=20, help="Verified users created before the run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Route weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--rate-limit", action="store_true",
+        help="Keep the auth rate limits on for the in-process app (off by default)",
+    )
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed p95 regression ratio")
+    sys.exit(asyncio.run(main(parser.parse_args())))
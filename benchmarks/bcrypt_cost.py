@@ -0,0 +1,61 @@
+"""
+Picks the bcrypt cost for this machine: the highest BCRYPT_ROUNDS whose
+hash time on one core stays within a budget.
+
+    python -m benchmarks.bcrypt_cost --target-ms 250
+
+Each cost from `--min-rounds` up is timed `--samples` times and the median
+is compared with the budget; one more round doubles the time. Run it on
+the hardware that serves logins and set the result as BCRYPT_ROUNDS.
+Existing hashes at another cost are replaced on each user's next login.
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+from app.config.settings import settings
+
+MAX_ROUNDS = 31
+
+
+def measure(rounds: int, samples: int) -> float:
+    """Returns the median time of one hash at `rounds` in milliseconds."""
+    handler = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def calibrate(target_ms: float, min_rounds: int, samples: int) -> tuple[int, dict[int, float]]:
+    """Returns the chosen cost, never below `min_rounds`, and the time of each cost tried."""
+    timings = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, MAX_ROUNDS + 1):
+        timings[rounds] = measure(rounds, samples)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="hash time budget per login")
+    parser.add_argument("--min-rounds", type=int, default=10, help="lowest cost to recommend")
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    chosen, timings = calibrate(args.target_ms, args.min_rounds, args.samples)
+    print(f"{'rounds':<8}{'ms/hash':>10}{'hashes/s/core':>16}")
+    for rounds, ms in timings.items():
+        mark = "  <- chosen" if rounds == chosen else ""
+        print(f"{rounds:<8}{ms:>10.1f}{1000 / ms:>16.1f}{mark}")
+    if timings[chosen] > args.target_ms:
+        print(f"warning: even {chosen} rounds take {timings[chosen]:.1f} ms, over the {args.target_ms:g} ms budget")
+    print(f"current: BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS}")
+    print(f"BCRYPT_ROUNDS={chosen}")
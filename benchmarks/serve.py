@@ -0,0 +1,35 @@
+"""
+Runs the API under uvicorn with email dispatch stubbed, for benchmarking
+over real HTTP:
+
+    python -m benchmarks.serve --port 8000
+"""
+import argparse
+
+import uvicorn
+from fastapi import HTTPException
+
+from app.main import app
+from app.services.rate_limit import rate_limiter
+
+from .stubs import sent_codes, stub_email_tasks
+
+stub_email_tasks()
+
+
+@app.get("/__bench__/codes/{email}", include_in_schema=False)
+async def bench_code(email: str):
+    code = sent_codes.get(email.lower())
+    if code is None:
+        raise HTTPException(status_code=404, detail="No code sent")
+    return {"code": code}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--rate-limit", action="store_true", help="Keep the auth rate limits on")
+    args = parser.parse_args()
+    rate_limiter.enabled = args.rate_limit
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
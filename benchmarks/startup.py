@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark: import time and time to the first served request,
+each run in a fresh interpreter.
+
+    python -m benchmarks.startup --runs 5
+
+The web target imports `app.main`, enters the lifespan, waits for
+`/health/ready` and serves one `POST /auth/login` for an unknown email (one
+SQL query, no bcrypt). The
+worker target imports the Celery app with its task modules and runs one
+query on the sync engine.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("celery", "psycopg2", "asyncpg", "redis")
+
+
+def loaded_modules() -> dict:
+    return {name: name in sys.modules for name in HEAVY_MODULES}
+
+
+def child_web() -> dict:
+    start = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+    modules = loaded_modules()
+
+    import httpx
+
+    async def first_request():
+        async with app.router.lifespan_context(app):
+            started = time.perf_counter()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+                while (await client.get("/health/ready")).status_code != 200:
+                    await asyncio.sleep(0.005)
+                ready = time.perf_counter()
+                response = await client.post(
+                    "/auth/login", json={"email": "startup@example.com", "password": "x"}
+                )
+            return started, ready, time.perf_counter(), response.status_code
+
+    started, ready, served, status_code = asyncio.run(first_request())
+    return {
+        "import_s": imported - start,
+        "lifespan_s": started - imported,
+        "warmup_s": ready - started,
+        "first_request_s": served - ready,
+        "total_s": served - start,
+        "status": status_code,
+        "modules": modules,
+    }
+
+
+def child_worker() -> dict:
+    start = time.perf_counter()
+    from app.tasks.celery import celery_app
+    celery_app.loader.import_default_modules()
+    imported = time.perf_counter()
+    modules = loaded_modules()
+
+    from sqlalchemy import text
+
+    from app.config.database import get_session_local
+
+    with get_session_local()() as db:
+        db.execute(text("SELECT 1"))
+    served = time.perf_counter()
+    return {
+        "import_s": imported - start,
+        "first_request_s": served - imported,
+        "total_s": served - start,
+        "modules": modules,
+    }
+
+
+CHILDREN = {"web": child_web, "worker": child_worker}
+
+
+def run_child(target: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", target],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(args) -> int:
+    for target in args.targets:
+        runs = [run_child(target) for _ in range(args.runs)]
+        timings = [key for key in runs[0] if key.endswith("_s")]
+        print(f"{target} ({args.runs} runs, median ms)")
+        for key in timings:
+            print(f"  {key[:-2]:<16}{statistics.median(run[key] for run in runs) * 1000:>10.1f}")
+        loaded = [name for name, present in runs[0]["modules"].items() if present]
+        print(f"  loaded: {', '.join(loaded) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--targets", nargs="+", choices=list(CHILDREN), default=list(CHILDREN))
+    parser.add_argument("--child", choices=list(CHILDREN), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(CHILDREN[args.child]()))
+        sys.exit(0)
+    sys.exit(main(args))
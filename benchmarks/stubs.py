@@ -0,0 +1,37 @@
+import re
+
+from app.tasks.send_mail_tasks import send_email_batch_task, send_email_task
+
+CODE_RE = re.compile(r"Code: (\d{6})")
+
+# Verification codes captured from stubbed emails, keyed by recipient.
+sent_codes: dict[str, str] = {}
+
+
+def _capture(to_email: str, body: str, **kwargs):
+    match = CODE_RE.search(body)
+    if match:
+        sent_codes[to_email.lower()] = match.group(1)
+
+
+def _delay_one(*args, **kwargs):
+    _capture(**kwargs)
+
+
+def _delay_batch(messages, **kwargs):
+    for message in messages:
+        _capture(**message)
+
+
+def _apply_async(fn):
+    def apply_async(args=None, kwargs=None, **options):
+        return fn(*(args or ()), **(kwargs or {}))
+    return apply_async
+
+
+def stub_email_tasks():
+    """Replaces Celery dispatch of email tasks so no broker or SMTP is needed."""
+    send_email_task.delay = _delay_one
+    send_email_task.apply_async = _apply_async(_delay_one)
+    send_email_batch_task.delay = _delay_batch
+    send_email_batch_task.apply_async = _apply_async(_delay_batch)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import uuid
+
+import asyncpg
+import httpx
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Settings has required fields; fill any the environment does not set with
+# values that point nowhere real, so modules import without a `.env`.
+for name, value in {
+    "SECRET_KEY": "test-secret",
+    "DB_HOST": "127.0.0.1",
+    "DB_PORT": "5432",
+    "DB_USER": "postgres",
+    "DB_PASS": "",
+    "DB_NAME": "coffee_test",
+    "EMAIL_HOST_USER": "noreply@example.com",
+    "EMAIL_HOST_PASSWORD": "",
+    "EMAIL_PORT": "2525",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    # Keep tests fast and free of background work against the database.
+    "BCRYPT_ROUNDS": "4",
+    "OUTBOX_RELAY_ENABLED": "false",
+    "WARMUP_ENABLED": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Skips the test unless the database in the DB_* settings accepts
+    connections. Tests that use it expect the schema at alembic head.
+    """
+    from app.config.settings import settings
+
+    async def ping():
+        engine = create_async_engine(
+            settings.DATABASE_URL, poolclass=NullPool, connect_args={"timeout": 2}
+        )
+        try:
+            async with engine.connect():
+                pass
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(ping())
+    except (OSError, TimeoutError, asyncpg.PostgresError, SQLAlchemyError) as e:
+        pytest.skip(f"No database: {e}")
+
+
+@pytest.fixture
+def api(database):
+    """
+    Returns `run(fn)`, which starts the app with its lifespan and awaits
+    `fn(client)` with an httpx client bound to it.
+    """
+    from app.main import app
+
+    def run(fn):
+        async def main():
+            async with app.router.lifespan_context(app):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    await fn(client)
+
+        asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def make_user():
+    """Returns an async factory of verified users; call it inside `api`."""
+    from app.common.enums import Role, UserStatus
+    from app.config.database import get_async_session_maker
+    from app.models.user import User
+    from app.services.password import hash_password
+
+    async def make(role: Role = Role.USER, password: str = "password") -> User:
+        async with get_async_session_maker()() as db:
+            user = User(
+                email=f"test-{uuid.uuid4().hex[:12]}@example.com",
+                password=await hash_password(password),
+                status=UserStatus.VERIFIED,
+                role=role,
+            )
+            db.add(user)
+            await db.commit()
+            return user
+
+    return make
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.common.enums import UserStatus
+from app.config.dao import is_unique_violation
+from app.schemas.user import UserBulkUpdate
+
+
+@pytest.mark.parametrize("field", ["email", "status", "role"])
+def test_rejects_null_for_not_null_columns(field):
+    with pytest.raises(ValidationError):
+        UserBulkUpdate(id=1, **{field: None})
+
+
+def test_keeps_only_sent_fields():
+    item = UserBulkUpdate(id=1, status=UserStatus.VERIFIED, first_name=None)
+
+    assert item.model_dump(exclude_unset=True) == {
+        "id": 1,
+        "status": UserStatus.VERIFIED,
+        "first_name": None,
+    }
+
+
+@pytest.mark.parametrize(("sqlstate", "expected"), [("23505", True), ("23502", False)])
+def test_is_unique_violation(sqlstate, expected):
+    error = IntegrityError("UPDATE users ...", {}, SimpleNamespace(sqlstate=sqlstate))
+
+    assert is_unique_violation(error) is expected
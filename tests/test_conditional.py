@@ -0,0 +1,122 @@
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.common.conditional import is_not_modified, row_etag, rows_etag
+from app.common.enums import Role
+
+UPDATED_AT = datetime(2026, 5, 4, 12, 30, 15, 250000, tzinfo=UTC)
+ETAG = row_etag(7, UPDATED_AT)
+
+
+def request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (ETAG, True),
+        (f'"other", W/{ETAG}', True),
+        ("*", True),
+        ('"other"', False),
+        (row_etag(7, UPDATED_AT, "id+email"), False),
+    ],
+)
+def test_if_none_match(if_none_match, expected):
+    assert is_not_modified(request(if_none_match=if_none_match), ETAG, UPDATED_AT) is expected
+
+
+@pytest.mark.parametrize(
+    ("since", "expected"),
+    [
+        (http_date(UPDATED_AT), True),
+        (http_date(UPDATED_AT + timedelta(hours=1)), True),
+        (http_date(UPDATED_AT - timedelta(seconds=1)), False),
+        ("not a date", False),
+    ],
+)
+def test_if_modified_since(since, expected):
+    assert is_not_modified(request(if_modified_since=since), ETAG, UPDATED_AT) is expected
+
+
+def test_if_none_match_takes_precedence():
+    headers = request(if_none_match='"other"', if_modified_since=http_date(UPDATED_AT))
+
+    assert not is_not_modified(headers, ETAG, UPDATED_AT)
+
+
+def test_rows_etag_changes_with_any_row():
+    rows = [SimpleNamespace(id=1, updated_at=UPDATED_AT), SimpleNamespace(id=2, updated_at=UPDATED_AT)]
+    changed = [rows[0], SimpleNamespace(id=2, updated_at=UPDATED_AT + timedelta(microseconds=1))]
+
+    assert rows_etag(rows) != rows_etag(changed)
+    assert rows_etag(rows) != rows_etag(rows[:1])
+
+
+async def auth_headers(client, user) -> dict:
+    response = await client.post("/auth/login", json={"email": user.email, "password": "password"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_me_answers_conditional_requests(api, make_user):
+    async def scenario(client):
+        user = await make_user()
+        headers = await auth_headers(client, user)
+
+        first = await client.get("/users/me", headers=headers)
+        assert first.status_code == 200
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+        hit = await client.get("/users/me", headers={**headers, "If-None-Match": etag})
+        assert hit.status_code == 304
+        assert hit.headers["etag"] == etag
+        miss = await client.get("/users/me", headers={**headers, "If-None-Match": '"other"'})
+        assert miss.status_code == 200
+
+        hit = await client.get("/users/me", headers={**headers, "If-Modified-Since": last_modified})
+        assert hit.status_code == 304
+        earlier = http_date(datetime.now(UTC) - timedelta(days=1))
+        miss = await client.get("/users/me", headers={**headers, "If-Modified-Since": earlier})
+        assert miss.status_code == 200
+
+        updated = await client.patch(f"/users/{user.id}", headers=headers, json={"first_name": "Ann"})
+        assert updated.status_code == 200
+        after = await client.get("/users/me", headers={**headers, "If-None-Match": etag})
+        assert after.status_code == 200
+        assert after.headers["etag"] != etag
+        assert after.json()["first_name"] == "Ann"
+
+    api(scenario)
+
+
+def test_list_etag_follows_page_rows(api, make_user):
+    async def scenario(client):
+        admin = await make_user(role=Role.ADMIN)
+        user = await make_user()
+        headers = await auth_headers(client, admin)
+        # The page holding only `user`.
+        page = {"after": user.id - 1, "limit": 1}
+
+        first = await client.get("/users/", headers=headers, params=page)
+        assert first.status_code == 200
+        assert [item["id"] for item in first.json()["items"]] == [user.id]
+        etag = first.headers["etag"]
+
+        hit = await client.get("/users/", headers={**headers, "If-None-Match": etag}, params=page)
+        assert hit.status_code == 304
+
+        await client.patch(f"/users/{user.id}", headers=headers, json={"last_name": "Lee"})
+        miss = await client.get("/users/", headers={**headers, "If-None-Match": etag}, params=page)
+        assert miss.status_code == 200
+        assert miss.headers["etag"] != etag
+
+    api(scenario)
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.password import PasswordHasher
+
+
+def blocking(release: threading.Event):
+    release.wait(5)
+    return "done", 0.0
+
+
+def failing():
+    raise ValueError("broken hash")
+
+
+def test_rejects_when_saturated():
+    hasher = PasswordHasher(kind="thread", workers=1, queue_size=0)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.create_task(hasher._submit("bcrypt_hash", blocking, release))
+        await asyncio.sleep(0)
+        assert hasher.stats()["in_flight"] == 1
+
+        with pytest.raises(HTTPException) as rejected:
+            await hasher.hash("password")
+
+        release.set()
+        assert await running == "done"
+        return rejected.value
+
+    try:
+        error = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert error.status_code == 503
+    assert error.headers == {"Retry-After": "1"}
+    assert hasher.rejected == 1
+    assert hasher.completed == 1
+    assert hasher.stats()["in_flight"] == 0
+
+
+def test_failed_operation_frees_its_slot():
+    hasher = PasswordHasher(kind="thread", workers=1, queue_size=0)
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await hasher._submit("bcrypt_hash", failing)
+        return await hasher.hash("password")
+
+    try:
+        hashed = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+
+    assert hashed.startswith("$2b$")
+    assert hasher.stats()["in_flight"] == 0
+    assert hasher.rejected == 0
+
+
+def test_start_forks_process_workers():
+    hasher = PasswordHasher(kind="process", workers=2, queue_size=0)
+    try:
+        asyncio.run(hasher.start())
+
+        assert len(hasher._executor._processes) == 2
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,126 @@
+"""
+Checks that every filter of the admin user list is served by an index.
+
+Plans depend on table size and value distribution, so the check does not
+use the rows already in `users`. Inside a transaction that is rolled back
+it shadows the table with a temporary copy carrying the same indexes,
+fills it with `ROWS` synthetic users (2% unverified, 0.5% admins, one
+created per minute, random hex names and emails) and analyzes it. It then
+runs EXPLAIN on the list page query for each filterable column of
+`UserDAO` and expects the plan to use the index meant for it.
+"""
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import app.main  # noqa: F401  registers every model with the mapper
+from app.common.enums import Role, UserStatus
+from app.config.dao import Filter
+from app.config.settings import settings
+from app.models.user import User
+from app.services.user_dao import UserDAO
+
+ROWS = 200000
+LIMIT = 51
+NOW = datetime.now(UTC)
+
+# pg_temp comes first on the search path, so the copy shadows `users` for
+# the unqualified queries SQLAlchemy emits.
+SHADOW_SQL = (
+    "CREATE TEMP TABLE users (LIKE public.users INCLUDING ALL) ON COMMIT DROP",
+    """
+    INSERT INTO users (id, email, password, first_name, last_name, status, role, created_at, updated_at)
+    SELECT
+        g, md5(g::text) || '@example.com', 'x',
+        substr(md5('first' || g), 1, 10), substr(md5('last' || g), 1, 10),
+        (CASE WHEN g % 50 = 0 THEN 'UNVERIFIED' ELSE 'VERIFIED' END)::user_status,
+        (CASE WHEN g % 200 = 0 THEN 'ADMIN' ELSE 'USER' END)::user_role,
+        now() - g * interval '1 minute', now() - g * interval '1 minute'
+    FROM generate_series(1, :rows) AS g
+    """,
+    "ANALYZE users",
+)
+
+# The copy's indexes get generated names; match them to the real ones on
+# their definition, which is everything after USING.
+INDEX_DEFS_SQL = text("""
+    SELECT c.relname, split_part(pg_get_indexdef(i.indexrelid), ' USING ', 2)
+    FROM pg_index AS i JOIN pg_class AS c ON c.oid = i.indexrelid
+    WHERE i.indrelid = CAST(:table AS regclass)
+""")
+
+# (filter, index the plan must use)
+CASES = (
+    (Filter("status", "eq", UserStatus.UNVERIFIED), "ix_users_status_id"),
+    (Filter("status", "in", [UserStatus.UNVERIFIED]), "ix_users_status_id"),
+    (Filter("role", "eq", Role.ADMIN), "ix_users_role_id"),
+    (Filter("role", "in", [Role.ADMIN]), "ix_users_role_id"),
+    (Filter("created_at", "range", (NOW - timedelta(hours=1), NOW)), "ix_users_created_at"),
+    (Filter("updated_at", "range", (NOW - timedelta(hours=1), None)), "ix_users_updated_at"),
+    (Filter("email", "prefix", "AB12"), "ix_users_email_lower_pattern"),
+    (Filter("first_name", "prefix", "Cd34"), "ix_users_first_name_lower_pattern"),
+    (Filter("last_name", "prefix", "eF56"), "ix_users_last_name_lower_pattern"),
+)
+
+
+def used_indexes(plan: dict) -> set[str]:
+    found = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        found |= used_indexes(child)
+    return found
+
+
+async def explain(conn, f: Filter) -> set[str]:
+    stmt = UserDAO.page_query([User.id, User.updated_at], LIMIT, filters=[f])
+    sql = stmt.compile(conn.engine, compile_kwargs={"literal_binds": True})
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return used_indexes(plan[0]["Plan"])
+
+
+async def index_names(conn) -> dict[str, str]:
+    """Maps the names of the copy's indexes to those of `public.users`."""
+    real = {
+        definition: name
+        for name, definition in await conn.execute(INDEX_DEFS_SQL, {"table": "public.users"})
+    }
+    shadow = await conn.execute(INDEX_DEFS_SQL, {"table": "pg_temp.users"})
+    return {name: real.get(definition, name) for name, definition in shadow}
+
+
+async def collect_plans() -> list[set[str]]:
+    """Returns the indexes the plan of each case uses, by their real names."""
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as conn:
+            for sql in SHADOW_SQL:
+                await conn.execute(text(sql), {"rows": ROWS})
+            names = await index_names(conn)
+            plans = [
+                {names.get(name, name) for name in await explain(conn, f)} for f, _ in CASES
+            ]
+            await conn.rollback()
+    finally:
+        await engine.dispose()
+    return plans
+
+
+@pytest.fixture(scope="module")
+def plans(database):
+    return asyncio.run(collect_plans())
+
+
+@pytest.mark.parametrize(
+    ("case", "expected"),
+    [(n, expected) for n, (_, expected) in enumerate(CASES)],
+    ids=[f"{f.column}-{f.op}" for f, _ in CASES],
+)
+def test_filter_uses_index(plans, case, expected):
+    assert expected in plans[case]
@@ -0,0 +1,14 @@
+import pytest
+
+from app.services.rate_limit import Limit
+
+
+def test_parse():
+    assert Limit.parse("30/minute") == Limit(capacity=30, rate=0.5)
+    assert Limit.parse("") is None
+
+
+@pytest.mark.parametrize("value", ["0/minute", "-1/minute", "ten/minute", "10/fortnight", "10"])
+def test_parse_rejects_invalid_limits(value):
+    with pytest.raises(ValueError, match="Rate limit|rate limit"):
+        Limit.parse(value)
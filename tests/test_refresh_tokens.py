@@ -0,0 +1,51 @@
+from app.custom_jwt.services import create_refresh_token
+
+
+async def login(client, user) -> dict:
+    response = await client.post("/auth/login", json={"email": user.email, "password": "password"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_refresh_is_rejected_after_logout(api, make_user):
+    async def scenario(client):
+        tokens = await login(client, await make_user())
+        token = {"token": tokens["refresh_token"]}
+
+        refreshed = await client.post("/auth/refresh", params=token)
+        assert refreshed.status_code == 200
+        assert refreshed.json()["access_token"]
+
+        assert (await client.post("/auth/logout", params=token)).status_code == 200
+        assert (await client.post("/auth/refresh", params=token)).status_code == 401
+        assert (await client.post("/auth/logout", params=token)).status_code == 401
+
+    api(scenario)
+
+
+def test_logout_rejects_token_never_issued(api, make_user):
+    async def scenario(client):
+        user = await make_user()
+        # Validly signed, but never stored by a login.
+        token, _ = create_refresh_token({"sub": str(user.id)})
+
+        response = await client.post("/auth/logout", params={"token": token})
+
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid refresh token"
+
+    api(scenario)
+
+
+def test_refresh_keeps_other_sessions(api, make_user):
+    async def scenario(client):
+        user = await make_user()
+        first = await login(client, user)
+        second = await login(client, user)
+
+        await client.post("/auth/logout", params={"token": first["refresh_token"]})
+
+        response = await client.post("/auth/refresh", params={"token": second["refresh_token"]})
+        assert response.status_code == 200
+
+    api(scenario)
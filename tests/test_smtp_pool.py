@@ -0,0 +1,176 @@
+import logging
+import smtplib
+import socket
+import time
+
+import pytest
+from aiosmtpd.controller import Controller
+from celery.exceptions import Retry
+
+from app.tasks import send_mail_tasks
+from app.tasks.smtp import SMTPConnectionPool, build_message
+
+
+class RecordingHandler:
+    """Records each delivery with the client address it arrived from; refuses `refused` recipients."""
+
+    def __init__(self):
+        self.deliveries: list[tuple[tuple, list[str]]] = []
+        self.sessions = []
+        self.refused: set[str] = set()
+        self.rcpt_attempts = 0
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.rcpt_attempts += 1
+        if address in self.refused:
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.deliveries.append((session.peer, envelope.rcpt_tos))
+        self.sessions.append(server)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class LocalSMTPServer:
+    def __init__(self):
+        self.port = free_port()
+        self.handler = RecordingHandler()
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=self.port)
+
+    def drop_connections(self):
+        """Closes every client connection from the server side."""
+        for session in self.handler.sessions:
+            self.controller.loop.call_soon_threadsafe(session.transport.close)
+        time.sleep(0.1)
+
+    @property
+    def peers(self) -> list[tuple]:
+        return [peer for peer, _ in self.handler.deliveries]
+
+
+@pytest.fixture
+def smtp_server():
+    server = LocalSMTPServer()
+    server.controller.start()
+    yield server
+    server.controller.stop()
+
+
+@pytest.fixture
+def pool(smtp_server):
+    pool = SMTPConnectionPool(
+        host="127.0.0.1",
+        port=smtp_server.port,
+        user="noreply@example.com",
+        password="",
+        use_tls=False,
+        size=2,
+        idle_timeout=60,
+    )
+    yield pool
+    pool.close_all()
+
+
+def message(n: int):
+    return build_message(f"user{n}@example.com", "Subject", "Body")
+
+
+def test_reuses_session(pool, smtp_server):
+    for n in range(3):
+        pool.send_message(message(n))
+
+    assert pool.opened == 1
+    assert len(set(smtp_server.peers)) == 1
+    assert [rcpt for _, rcpt in smtp_server.handler.deliveries] == [
+        [f"user{n}@example.com"] for n in range(3)
+    ]
+
+
+def test_reconnects_after_dropped_connection(pool, smtp_server, caplog):
+    pool.send_message(message(0))
+    smtp_server.drop_connections()
+
+    with caplog.at_level(logging.INFO, logger="app.tasks.smtp"):
+        pool.send_message(message(1))
+
+    assert "reconnecting" in caplog.text
+    assert pool.opened == 2
+    assert len(smtp_server.handler.deliveries) == 2
+    first, second = smtp_server.peers
+    assert first != second
+
+
+def test_replaces_idle_session(pool, smtp_server):
+    pool.idle_timeout = 0
+    pool.send_message(message(0))
+    pool.send_message(message(1))
+
+    assert pool.opened == 2
+    assert len(smtp_server.handler.deliveries) == 2
+
+
+def test_refused_recipient_keeps_session(pool, smtp_server):
+    smtp_server.handler.refused.add("user0@example.com")
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send_message(message(0))
+    pool.send_message(message(1))
+
+    assert smtp_server.handler.rcpt_attempts == 2
+    assert pool.opened == 1
+    assert [rcpt for _, rcpt in smtp_server.handler.deliveries] == [["user1@example.com"]]
+
+
+def batch(*numbers: int) -> list[dict]:
+    return [{"to_email": f"user{n}@example.com", "subject": "Subject", "body": "Body"} for n in numbers]
+
+
+def test_batch_fails_only_refused_recipients(pool, smtp_server, monkeypatch):
+    monkeypatch.setattr(send_mail_tasks, "get_smtp_pool", lambda: pool)
+    smtp_server.handler.refused.add("user1@example.com")
+
+    result = send_mail_tasks.send_email_batch_task.run(batch(0, 1, 2))
+
+    assert result["sent"] == 2
+    assert result["failed"] == ["user1@example.com"]
+    assert pool.opened == 1
+
+
+def test_batch_retries_unsent_messages(pool, smtp_server, monkeypatch):
+    task = send_mail_tasks.send_email_batch_task
+    monkeypatch.setattr(send_mail_tasks, "get_smtp_pool", lambda: pool)
+    retries = []
+    monkeypatch.setattr(task, "retry", lambda **kwargs: retries.append(kwargs) or Retry())
+    send = pool.send
+
+    def send_first_only(server, msg):
+        if smtp_server.handler.deliveries:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        send(server, msg)
+
+    monkeypatch.setattr(pool, "send", send_first_only)
+
+    with pytest.raises(Retry):
+        task.run(batch(0, 1, 2))
+
+    assert [rcpt for _, rcpt in smtp_server.handler.deliveries] == [["user0@example.com"]]
+    assert pool.opened == 2
+    assert retries[0]["args"] == (batch(1, 2),)
+
+
+def test_batch_raises_once_retries_run_out(pool, monkeypatch):
+    task = send_mail_tasks.send_email_batch_task
+    monkeypatch.setattr(send_mail_tasks, "get_smtp_pool", lambda: pool)
+    monkeypatch.setattr(task, "max_retries", 0)
+    pool.port = free_port()
+
+    with pytest.raises(OSError):
+        task.run(batch(0, 1))
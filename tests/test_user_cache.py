@@ -0,0 +1,43 @@
+import asyncio
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.common.enums import Role, UserStatus
+from app.config.settings import settings
+from app.services.user_cache import UserCache, cache_redis_url
+
+
+@pytest.mark.parametrize(
+    ("own", "broker", "expected"),
+    [
+        ("redis://cache:6379/2", "redis://broker:6379/0", "redis://cache:6379/2"),
+        (None, "redis://broker:6379/0", "redis://broker:6379/0"),
+        (None, "amqp://broker:5672//", None),
+    ],
+)
+def test_redis_url_falls_back_to_broker(monkeypatch, own, broker, expected):
+    monkeypatch.setattr(settings, "USER_CACHE_REDIS_URL", own)
+    monkeypatch.setattr(settings, "CELERY_BROKER_URL", broker)
+
+    assert cache_redis_url() == expected
+
+
+def test_keeps_nothing_without_redis():
+    cache = UserCache(maxsize=10, ttl=60)
+    user = SimpleNamespace(
+        id=1, email="ann@example.com", first_name=None, last_name=None,
+        status=UserStatus.VERIFIED, role=Role.ADMIN, updated_at=datetime.now(UTC),
+    )
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return user
+
+    asyncio.run(cache.get_or_load(1, loader))
+    asyncio.run(cache.get_or_load(1, loader))
+
+    assert len(loads) == 2
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.common.enums import UserStatus
+from app.config.database import get_session
+from app.main import app
+from app.routers import auth
+from app.services.user_dao import UserDAO
+from app.services.verify_codes import MemoryVerifyCodeStore, VerifyCodeStore
+
+
+def test_store_is_abstract():
+    with pytest.raises(TypeError):
+        VerifyCodeStore(60)
+
+
+def test_consume_returns_user_id():
+    store = MemoryVerifyCodeStore(60)
+    asyncio.run(store.save("Ann@Example.com", 7, "123456"))
+
+    assert asyncio.run(store.consume(None, "ann@example.com", "123456")) == 7
+
+
+def test_wrong_code_keeps_code():
+    store = MemoryVerifyCodeStore(60)
+    asyncio.run(store.save("ann@example.com", 7, "123456"))
+
+    assert asyncio.run(store.consume(None, "ann@example.com", "654321")) is None
+    assert asyncio.run(store.consume(None, "ann@example.com", "123456")) == 7
+
+
+def test_expired_code_is_rejected(monkeypatch):
+    store = MemoryVerifyCodeStore(60)
+    asyncio.run(store.save("ann@example.com", 7, "123456"))
+    now = store._codes["ann@example.com"][0] + 1
+    monkeypatch.setattr("app.services.verify_codes.time.monotonic", lambda: now)
+
+    assert asyncio.run(store.consume(None, "ann@example.com", "123456")) is None
+    assert "ann@example.com" not in store._codes
+
+
+def test_save_drops_expired_codes(monkeypatch):
+    store = MemoryVerifyCodeStore(60)
+    now = 1000.0
+    monkeypatch.setattr("app.services.verify_codes.time.monotonic", lambda: now)
+    asyncio.run(store.save("ann@example.com", 7, "123456"))
+    asyncio.run(store.save("bob@example.com", 8, "123456"))
+
+    now += 30
+    asyncio.run(store.save("ann@example.com", 7, "654321"))
+    now += 45
+    asyncio.run(store.save("cat@example.com", 9, "123456"))
+
+    assert list(store._codes) == ["ann@example.com", "cat@example.com"]
+
+
+def test_code_is_single_use():
+    store = MemoryVerifyCodeStore(60)
+    asyncio.run(store.save("ann@example.com", 7, "123456"))
+
+    assert asyncio.run(store.consume(None, "ann@example.com", "123456")) == 7
+    assert asyncio.run(store.consume(None, "ann@example.com", "123456")) is None
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def verify(monkeypatch):
+    """Posts to `/auth/verify` with a memory store and an in-process user table."""
+    store = MemoryVerifyCodeStore(60)
+    session = FakeSession()
+    users = {}
+
+    async def get_by_id(db, user_id):
+        return users.get(user_id)
+
+    async def fake_session():
+        yield session
+
+    monkeypatch.setattr(auth, "code_store", store)
+    monkeypatch.setattr(UserDAO, "get_by_id", get_by_id)
+    app.dependency_overrides[get_session] = fake_session
+    client = TestClient(app)
+
+    def post(email, code):
+        return client.post("/auth/verify", json={"email": email, "code": code})
+
+    yield SimpleNamespace(post=post, store=store, session=session, users=users)
+    app.dependency_overrides.pop(get_session)
+
+
+def test_verify_marks_user_verified(verify):
+    user = SimpleNamespace(id=7, status=UserStatus.UNVERIFIED)
+    verify.users[7] = user
+    asyncio.run(verify.store.save("ann@example.com", 7, "123456"))
+
+    response = verify.post("ann@example.com", "123456")
+
+    assert response.status_code == 200
+    assert user.status == UserStatus.VERIFIED
+    assert verify.session.commits == 1
+    assert verify.post("ann@example.com", "123456").status_code == 400
+
+
+def test_verify_rejects_code_of_deleted_user(verify):
+    asyncio.run(verify.store.save("ann@example.com", 7, "123456"))
+
+    response = verify.post("ann@example.com", "123456")
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid code"
+    assert verify.session.commits == 0